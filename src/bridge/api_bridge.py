@@ -5,15 +5,15 @@ PyWebView API bridge for ffmpegMagic.
 import functools
 import json
 import logging
-import multiprocessing
 import os
 import platform
-import shutil
+import queue
 import subprocess
 import sys
 import threading
+import time
 import uuid
-import webbrowser
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
@@ -23,13 +23,14 @@ from models.VideoJoiner import VideoJoiner
 from models.VideoProcessor import VideoProcessor
 from models.constants import (
     CRF_MAX, CRF_MIN, HD_HEIGHT, HD_WIDTH, FHD_HEIGHT, FHD_WIDTH,
-    JOINED_OUTPUT_FILENAME, PRESET_OPTIONS, SUPPORTED_VIDEO_FORMATS,
-    UHD_4K_HEIGHT, UHD_4K_WIDTH,
+    JOINED_OUTPUT_FILENAME, PRESET_OPTIONS,
+    UHD_4K_HEIGHT, UHD_4K_WIDTH, UI_PROGRESS_INTERVAL,
 )
-from models.progress_reporter import ProgressReporter
 from utils import update_check
-from utils.core_functions import asset_file_uri
-from utils.ffmpeg_paths import check_ffmpeg_available, get_ffmpeg_exe, get_ffmpeg_info, subprocess_env
+from utils.core_functions import asset_file_uri, available_cores
+from utils.ffmpeg_paths import (
+    check_ffmpeg_available, detect_hw_encoder, get_ffmpeg_info,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -128,17 +129,42 @@ def _normalize_dialog_dir(initial_dir: str) -> str:
 
 
 class BridgeProgressReporter:
-    """Pushes progress to the web UI via evaluate_js."""
+    """Pushes progress to the web UI via evaluate_js.
+
+    Per-frame metrics (those carrying "percent") are coalesced to at most one
+    push per UI_PROGRESS_INTERVAL; any other update flushes them immediately.
+    """
 
     def __init__(self, api: "VideoEditorApi", job_id: str, job_type: str):
         self._api = api
         self._job_id = job_id
         self._job_type = job_type
+        # Parallel encode workers report through one reporter
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Any] = {}
+        self._last_flush = 0.0
 
     def _emit(self, event: str, payload: dict) -> None:
         self._api._emit_event(event, {**payload, "job_id": self._job_id})
 
     def on_progress(self, metrics: dict) -> None:
+        with self._lock:
+            self._pending.update(metrics)
+            throttled = "percent" in metrics and metrics["percent"] < 100
+            if throttled and time.monotonic() - self._last_flush < UI_PROGRESS_INTERVAL:
+                return
+            self._flush_locked()
+
+    def flush(self) -> None:
+        """Push any coalesced progress metrics to the UI."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        metrics, self._pending = self._pending, {}
+        self._last_flush = time.monotonic()
         if self._job_type == "compress":
             self._emit("compress_progress", metrics)
         else:
@@ -151,9 +177,97 @@ class BridgeProgressReporter:
             self._emit("join_log", {"line": line})
 
     def on_file_status(self, index: int, status: str) -> None:
+        self.flush()
         self._emit("compress_file_status", {"index": index, "status": status})
 
 
+class _BatchProgress:
+    """Merges the progress of files encoding in parallel into one job total.
+
+    Each worker reports through its own lane (see for_file). Percent is the
+    mean over every file in the job, so the bar moves forward instead of
+    jumping between whichever files reported last.
+    """
+
+    def __init__(self, reporter: BridgeProgressReporter, file_count: int):
+        self._reporter = reporter
+        self._file_count = max(1, file_count)
+        self._lock = threading.Lock()
+        self._percent: Dict[int, float] = {}
+        self._frames: Dict[int, tuple] = {}
+        self._fps: Dict[int, float] = {}
+        self._active: Dict[int, str] = {}
+        self._start = time.perf_counter()
+
+    def for_file(self, index: int, name: str) -> "_FileProgressLane":
+        with self._lock:
+            self._active[index] = name
+            summary = self._summary()
+        self._reporter.on_progress(summary)
+        return _FileProgressLane(self, index)
+
+    def update(self, index: int, metrics: dict) -> None:
+        with self._lock:
+            if "percent" in metrics:
+                self._percent[index] = metrics["percent"]
+            if "frames_processed" in metrics:
+                self._frames[index] = (metrics["frames_processed"], metrics.get("total_frames") or 0)
+            if "fps" in metrics:
+                self._fps[index] = metrics["fps"]
+            summary = self._summary()
+        self._reporter.on_progress(summary)
+
+    def finish(self, index: int) -> None:
+        with self._lock:
+            self._percent[index] = 100.0
+            self._fps.pop(index, None)
+            self._active.pop(index, None)
+            summary = self._summary()
+        self._reporter.on_progress(summary)
+
+    def _summary(self) -> dict:
+        percent = min(100.0, sum(self._percent.values()) / self._file_count)
+        frames = sum(done for done, _ in self._frames.values())
+        total = sum(total for _, total in self._frames.values())
+        fps = sum(self._fps.values())
+        elapsed = time.perf_counter() - self._start
+        remaining = int(elapsed * (100 - percent) / percent) if percent > 0 else 0
+        hours, minutes = divmod(remaining, 3600)
+        minutes, seconds = divmod(minutes, 60)
+        rem_str = f"{hours:02}:{minutes:02}:{seconds:02}"
+        return {
+            "frames_processed": frames,
+            "total_frames": total,
+            "percent": percent,
+            "fps": fps,
+            "time_running_min": elapsed / 60,
+            "time_remaining": rem_str,
+            "Current File:": ", ".join(self._active[i] for i in sorted(self._active)),
+            "Frames Processed:": f"{frames}/{total}",
+            "Progress:": f"{percent:.2f}%",
+            "Average Frame Rate:": f"{fps:.1f} fps",
+            "Time Running:": f"{elapsed / 60:.2f} min",
+            "Time Remaining:": rem_str,
+        }
+
+
+class _FileProgressLane:
+    """ProgressReporter for one file of a parallel batch; progress goes to the batch total."""
+
+    def __init__(self, batch: _BatchProgress, index: int):
+        self._batch = batch
+        self._index = index
+
+    def on_progress(self, metrics: dict) -> None:
+        self._batch.update(self._index, metrics)
+
+    def on_log(self, line: str) -> None:
+        self._batch._reporter.on_log(line)
+
+    def on_file_status(self, index: int, status: str) -> None:
+        self._batch._reporter.on_file_status(index, status)
+
+
 @_wrap_ui_logging
 class VideoEditorApi:
     """JSON API exposed to JavaScript as window.pywebview.api."""
@@ -162,10 +276,16 @@ class VideoEditorApi:
         self._window = None
         self._config = get_config_manager()
         self._processor = VideoProcessor()
+        # Per-job processors beyond self._processor, guarded by _jobs_lock
+        self._job_processors: Dict[str, List[VideoProcessor]] = {}
         self._joiner = VideoJoiner()
         self._jobs_lock = threading.Lock()
         self._jobs: Dict[str, Dict[str, Any]] = {}
         self._job_threads: Dict[str, threading.Thread] = {}
+        # Worker threads queue UI events; one dispatcher thread talks to the window
+        self._events: "queue.Queue[str]" = queue.Queue()
+        self._event_thread: Optional[threading.Thread] = None
+        self._event_thread_lock = threading.Lock()
 
     def set_window(self, window) -> None:
         self._window = window
@@ -180,34 +300,46 @@ class VideoEditorApi:
         return {"status": "error", "message": str(message)}
 
     def _emit_event(self, handler: str, payload: dict) -> None:
+        """Queue a call to window.<handler>(payload) without blocking the caller."""
         if not self._window:
             return
-        try:
-            js = f"if (window.{handler}) window.{handler}({json.dumps(payload)});"
-            self._window.evaluate_js(js)
-        except Exception as e:
-            logger.debug(f"evaluate_js failed: {e}")
+        self._events.put(f"if (window.{handler}) window.{handler}({json.dumps(payload)});")
+        with self._event_thread_lock:
+            if self._event_thread is None or not self._event_thread.is_alive():
+                self._event_thread = threading.Thread(
+                    target=self._dispatch_events, name="ui-events", daemon=True,
+                )
+                self._event_thread.start()
+
+    def _dispatch_events(self) -> None:
+        """Send queued events to the window, batching whatever piled up into one evaluate_js."""
+        while True:
+            scripts = [self._events.get()]
+            while True:
+                try:
+                    scripts.append(self._events.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                if self._window:
+                    if len(scripts) == 1:
+                        self._window.evaluate_js(scripts[0])
+                    else:
+                        # One handler throwing must not drop the rest of the batch
+                        self._window.evaluate_js("\n".join(
+                            f"try {{ {js} }} catch (e) {{ console.error(e); }}" for js in scripts
+                        ))
+            except Exception as e:
+                logger.debug(f"evaluate_js failed: {e}")
+            finally:
+                for _ in scripts:
+                    self._events.task_done()
 
     def _check_ffmpeg(self) -> bool:
         return check_ffmpeg_available()
 
     def _check_gpu_available(self) -> bool:
-        try:
-            startupinfo = None
-            if os.name == "nt":
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            result = subprocess.run(
-                [get_ffmpeg_exe(), "-encoders"],
-                capture_output=True,
-                text=True,
-                timeout=15,
-                startupinfo=startupinfo,
-                env=subprocess_env(),
-            )
-            return "h264_nvenc" in result.stdout
-        except Exception:
-            return False
+        return detect_hw_encoder() is not None
 
     def prepare_startup(self) -> dict:
         if not self._check_ffmpeg():
@@ -225,7 +357,7 @@ class VideoEditorApi:
             "version": __version__,
             "app_name": "ffmpegMagic",
             "gpu_available": self._check_gpu_available(),
-            "cpu_cores": multiprocessing.cpu_count(),
+            "cpu_cores": available_cores(),
             "encoding_defaults": {
                 "crf": crf,
                 "preset": preset,
@@ -350,14 +482,20 @@ class VideoEditorApi:
                 "use_gpu": use_gpu,
                 "use_all_cores": use_all_cores,
                 "cap_cpu_50": cap_cpu_50,
+                "fast_encode": self._config.get_fast_encode_setting(),
             },
             "last_input_folder": self._config.get_last_input_folder(),
             "gpu_available": self._check_gpu_available(),
-            "cpu_cores": multiprocessing.cpu_count(),
+            "cpu_cores": available_cores(),
         })
 
-    def _video_to_dict(self, path: str, is_vertical: bool = False) -> dict:
-        vi = VideoInfo(path)
+    def compress_get_last_input_folder(self) -> dict:
+        """Last input folder only; cheaper than compress_get_options for file pickers."""
+        return self._ok({"last_input_folder": self._config.get_last_input_folder() or ""})
+
+    def _video_to_dict(self, path: str, is_vertical: bool = False, vi: Optional[VideoInfo] = None) -> dict:
+        if vi is None:
+            vi = VideoInfo(path)
         w, h = vi.width or 0, vi.height or 0
         if is_vertical and w and h:
             w, h = h, w
@@ -379,9 +517,9 @@ class VideoEditorApi:
 
     def compress_probe_videos(self, paths: List[str]) -> dict:
         items = []
-        for p in paths:
+        for p, vi in zip(paths, VideoInfo.probe_many(paths)):
             try:
-                items.append(self._video_to_dict(p))
+                items.append(self._video_to_dict(p, vi=vi))
             except Exception as e:
                 items.append({"path": p, "file": os.path.basename(p), "status": "Error", "error": str(e)})
         return self._ok({"videos": items})
@@ -406,6 +544,7 @@ class VideoEditorApi:
             settings.get("use_gpu", False),
             settings.get("use_all_cores", False),
             settings.get("cap_cpu_50", False),
+            settings.get("fast_encode", self._config.get_fast_encode_setting()),
         )
         fps_val = settings.get("fps")
         if fps_val:
@@ -443,76 +582,133 @@ class VideoEditorApi:
         thread.start()
         return self._ok({"job_id": job_id})
 
+    @staticmethod
+    def _compress_workers(use_gpu: bool, cpu_cores: int) -> int:
+        """Number of files to encode at once."""
+        return VideoProcessor.parallel_workers(use_gpu, cpu_cores)
+
+    def _is_cancelled(self, job_id: str) -> bool:
+        with self._jobs_lock:
+            return self._jobs.get(job_id, {}).get("state") == "cancelled"
+
     def _run_compress_job(
         self, job_id: str, videos: list, settings: dict,
         output_folder: str, width: str, height: str,
     ) -> None:
         reporter = BridgeProgressReporter(self, job_id, "compress")
-        use_gpu = settings.get("use_gpu", False)
+        use_gpu = settings.get("use_gpu", False) and self._check_gpu_available()
         use_all_cores = settings.get("use_all_cores", False)
         cap_cpu_50 = settings.get("cap_cpu_50", False)
-        cpu_cores = multiprocessing.cpu_count()
+        fast_encode = settings.get("fast_encode", self._config.get_fast_encode_setting())
+        # Stream copy ignores CRF/preset, so it only happens when asked for
+        copy_matching = settings.get("copy_matching", False)
+        cpu_cores = available_cores()
         threads = cpu_cores // 2 if cap_cpu_50 else (cpu_cores if use_all_cores else 0)
         crf = str(settings.get("crf", "30"))
         preset = settings.get("preset", "ultrafast")
         fps = settings.get("fps")
         target_fps = float(fps) if fps else None
 
+        workers = self._compress_workers(use_gpu, cpu_cores)
+        if workers > 1:
+            # Split the thread budget so parallel encodes don't oversubscribe the CPU
+            threads = max(1, (threads or cpu_cores) // workers)
+
         reporter.on_progress({
             "Total Files:": str(len(videos)),
             "Files Processed:": "0",
             "Current File:": "",
         })
 
+        # Probe the whole queue up front so ffprobe start-up overlaps across files
+        infos = VideoInfo.probe_many([item.get("path", "") for item in videos])
+
+        # One VideoProcessor per worker: each tracks its own FFmpeg child
+        processors: "queue.Queue[VideoProcessor]" = queue.Queue()
+        processors.put(self._processor)
+        extra = [VideoProcessor() for _ in range(workers - 1)]
+        for processor in extra:
+            processors.put(processor)
+        with self._jobs_lock:
+            self._job_processors[job_id] = extra
+        batch = _BatchProgress(reporter, len(videos)) if workers > 1 else None
+
+        progress_lock = threading.Lock()
         processed = 0
-        for index, item in enumerate(videos):
-            with self._jobs_lock:
-                if self._jobs.get(job_id, {}).get("state") == "cancelled":
-                    break
+
+        def compress_one(index: int, item: dict) -> None:
+            nonlocal processed
+            if self._is_cancelled(job_id):
+                return
 
             path = item.get("path", "")
-            is_vertical = item.get("is_vertical", False)
             w, h = width, height
-            if is_vertical:
+            if item.get("is_vertical", False):
                 w, h = height, width
 
             reporter.on_file_status(index, "Processing")
-            reporter.on_progress({"Current File:": os.path.basename(path)})
+            if batch:
+                file_reporter = batch.for_file(index, os.path.basename(path))
+            else:
+                file_reporter = reporter
+                reporter.on_progress({"Current File:": os.path.basename(path)})
 
-            vi = VideoInfo(path)
+            vi = infos[index]
             base, ext = os.path.splitext(os.path.basename(path))
-            out_name = f"{base}_scaled{ext}"
-            output_file = os.path.join(output_folder, out_name)
-
-            ok = False
-            if use_gpu and self._check_gpu_available():
-                ok = self._processor.scale_video_gpu(
-                    path, output_file,
-                    total_frames=vi.get_total_frames(),
-                    reporter=reporter,
-                    xaxis=w, yaxis=h,
-                    crf=crf, preset=preset, fps=target_fps,
-                    input_duration=vi.get_duration(), input_fps=vi.fps,
-                )
-            else:
-                ok = self._processor.scale_video_cpu(
-                    path, output_file,
-                    total_frames=vi.get_total_frames(),
-                    reporter=reporter,
-                    xaxis=w, yaxis=h,
-                    crf=crf, preset=preset, threads=threads, fps=target_fps,
-                    input_duration=vi.get_duration(), input_fps=vi.fps,
-                )
+            output_file = os.path.join(output_folder, f"{base}_scaled{ext}")
 
-            status = "Completed" if ok else "Error"
-            reporter.on_file_status(index, status)
+            processor = processors.get()
+            try:
+                if copy_matching and VideoProcessor.can_stream_copy(vi.codec, vi.width, vi.height, w, h, target_fps):
+                    ok = processor.remux_video(
+                        path, output_file,
+                        total_frames=vi.get_total_frames(),
+                        reporter=file_reporter,
+                        input_duration=vi.get_duration(),
+                    )
+                elif use_gpu:
+                    ok = processor.scale_video_gpu(
+                        path, output_file,
+                        total_frames=vi.get_total_frames(),
+                        reporter=file_reporter,
+                        xaxis=w, yaxis=h,
+                        crf=crf, preset=preset, fps=target_fps,
+                        input_duration=vi.get_duration(), input_fps=vi.fps,
+                        fast_encode=fast_encode,
+                    )
+                else:
+                    ok = processor.scale_video_cpu(
+                        path, output_file,
+                        total_frames=vi.get_total_frames(),
+                        reporter=file_reporter,
+                        xaxis=w, yaxis=h,
+                        crf=crf, preset=preset, threads=threads, fps=target_fps,
+                        input_duration=vi.get_duration(), input_fps=vi.fps,
+                        fast_encode=fast_encode,
+                    )
+            finally:
+                processors.put(processor)
+                if batch:
+                    batch.finish(index)
+
+            reporter.on_file_status(index, "Completed" if ok else "Error")
             if ok:
-                processed += 1
-                reporter.on_progress({"Files Processed:": str(processed)})
-            else:
-                with self._jobs_lock:
-                    if self._jobs.get(job_id, {}).get("state") == "cancelled":
+                with progress_lock:
+                    processed += 1
+                    reporter.on_progress({"Files Processed:": str(processed)})
+
+        try:
+            if workers == 1:
+                for index, item in enumerate(videos):
+                    if self._is_cancelled(job_id):
                         break
+                    compress_one(index, item)
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    list(executor.map(compress_one, range(len(videos)), videos))
+        finally:
+            with self._jobs_lock:
+                self._job_processors.pop(job_id, None)
 
         with self._jobs_lock:
             job = self._jobs.get(job_id)
@@ -522,6 +718,7 @@ class VideoEditorApi:
             job["state"] = "cancelled" if cancelled else "done"
             job["processed"] = processed
 
+        reporter.flush()
         self._emit_event("compress_complete", {
             "job_id": job_id,
             "processed": processed,
@@ -534,11 +731,16 @@ class VideoEditorApi:
                 if job_id not in self._jobs:
                     return self._err("Job not found")
                 self._jobs[job_id]["state"] = "cancelled"
+                extra = list(self._job_processors.get(job_id, []))
             else:
-                for job in self._jobs.values():
+                extra = []
+                for jid, job in self._jobs.items():
                     if job.get("type") == "compress" and job.get("state") == "running":
                         job["state"] = "cancelled"
+                        extra += self._job_processors.get(jid, [])
         self._processor.cancel()
+        for processor in extra:
+            processor.cancel()
         return self._ok()
 
     def compress_get_status(self, job_id: str) -> dict:
@@ -593,22 +795,18 @@ class VideoEditorApi:
 
     def _run_join_job(self, job_id: str, input_folder: str, output_folder: str, files: list) -> None:
         reporter = BridgeProgressReporter(self, job_id, "join")
-        concat_file = self._joiner.create_concat_file(files, input_folder)
         output_file = os.path.join(output_folder, JOINED_OUTPUT_FILENAME)
-        try:
-            ok = self._joiner.join_videos(concat_file, output_file, len(files), reporter=reporter)
-        finally:
-            if os.path.exists(concat_file):
-                try:
-                    os.remove(concat_file)
-                except OSError:
-                    pass
+        ok = self._joiner.join_files(
+            files, output_file, reporter=reporter,
+            total_duration=self._joiner.get_total_duration(files),
+        )
         with self._jobs_lock:
             job = self._jobs.get(job_id)
             if not job:
                 return
             cancelled = job.get("state") == "cancelled"
             job["state"] = "cancelled" if cancelled else ("done" if ok else "error")
+        reporter.flush()
         self._emit_event("join_complete", {
             "job_id": job_id,
             "success": ok and not cancelled,
@@ -637,6 +835,7 @@ class VideoEditorApi:
                 "use_gpu": use_gpu,
                 "use_all_cores": use_all_cores,
                 "cap_cpu_50": self._config.get_cpu_cap_setting(),
+                "fast_encode": self._config.get_fast_encode_setting(),
             },
             "encoding": {"crf": crf, "preset": preset, "resolution": resolution},
             "folders": {
@@ -672,6 +871,7 @@ class VideoEditorApi:
         if sys.platform == "win32":
             os.startfile(url)
         else:
+            import webbrowser
             webbrowser.open(url)
         return self._ok()
 
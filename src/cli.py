@@ -1,8 +1,8 @@
 import os
-import sys
 import argparse
+import queue
 import shutil
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from models.VideoProcessor import VideoProcessor
@@ -11,6 +11,7 @@ from models.ConfigManager import get_config_manager
 from models.VideoInfo import VideoInfo
 from models.progress_reporter import PrintProgressReporter
 from models.constants import HD_WIDTH, HD_HEIGHT, FHD_WIDTH, FHD_HEIGHT, UHD_4K_WIDTH, UHD_4K_HEIGHT
+from utils.core_functions import available_cores
 
 # Absolute paths relative to the script location
 SCRIPT_DIR = Path(__file__).parent.parent.absolute()
@@ -51,9 +52,6 @@ def list_incoming():
 
 def compress(args):
     config = get_config_manager()
-    processor = VideoProcessor()
-    reporter = PrintProgressReporter()
-    
     action_dir, orig_dir = create_action_dir("compress")
     
     files_to_process = []
@@ -76,50 +74,73 @@ def compress(args):
     use_gpu, use_all_cores = config.get_performance_settings()
     if args.gpu is not None:
         use_gpu = args.gpu
+    fast_encode = config.get_fast_encode_setting() if args.fast_encode is None else args.fast_encode
     
     print(f"Processing {len(files_to_process)} files...")
-    print(f"Settings: Resolution={res_name} ({width}x{height}), CRF={crf}, Preset={preset}, GPU={use_gpu}")
+    print(f"Settings: Resolution={res_name} ({width}x{height}), CRF={crf}, Preset={preset}, GPU={use_gpu}, Fast encode={fast_encode}")
     print(f"Results will be in: {action_dir}")
     
-    for input_path in files_to_process:
-        if not input_path.exists():
-            print(f"File not found: {input_path}")
-            continue
-            
+    for missing in [f for f in files_to_process if not f.exists()]:
+        print(f"File not found: {missing}")
+    files_to_process = [f for f in files_to_process if f.exists()]
+    infos = VideoInfo.probe_many([str(f) for f in files_to_process])
+    
+    workers = VideoProcessor.parallel_workers(use_gpu, available_cores())
+    # Split the cores between parallel encodes; 0 lets libx264 pick on its own
+    threads = max(1, available_cores() // workers) if workers > 1 else 0
+    processors = queue.Queue()
+    for _ in range(workers):
+        processors.put(VideoProcessor())
+    
+    def compress_one(input_path, vi):
         output_path = action_dir / f"compressed_{input_path.name}"
+        # Tag progress lines with the file name when encodes interleave
+        reporter = PrintProgressReporter(f"[{input_path.name}] " if workers > 1 else "")
         
         print(f"\nCompressing: {input_path.name} -> {output_path.name}")
         
-        vi = VideoInfo(str(input_path))
-        total_frames = vi.get_total_frames()
+        total_frames = (args.exact_frames and vi.count_frames()) or vi.get_total_frames()
         duration = vi.get_duration()
         fps = vi.fps
         
-        success = False
-        if use_gpu:
-            processor.scale_video_gpu(
-                str(input_path), str(output_path),
-                total_frames=total_frames,
-                reporter=reporter,
-                xaxis=width, yaxis=height,
-                crf=crf, preset=preset,
-                input_duration=duration, input_fps=fps
-            )
-            success = os.path.exists(output_path)
-        else:
-            processor.scale_video_cpu(
-                str(input_path), str(output_path),
-                total_frames=total_frames,
-                reporter=reporter,
-                xaxis=width, yaxis=height,
-                crf=crf, preset=preset,
-                input_duration=duration, input_fps=fps
-            )
-            success = os.path.exists(output_path)
+        processor = processors.get()
+        try:
+            if args.copy_matching and VideoProcessor.can_stream_copy(vi.codec, vi.width, vi.height, width, height):
+                processor.remux_video(
+                    str(input_path), str(output_path),
+                    total_frames=total_frames,
+                    reporter=reporter,
+                    input_duration=duration,
+                )
+            elif use_gpu:
+                processor.scale_video_gpu(
+                    str(input_path), str(output_path),
+                    total_frames=total_frames,
+                    reporter=reporter,
+                    xaxis=width, yaxis=height,
+                    crf=crf, preset=preset,
+                    input_duration=duration, input_fps=fps,
+                    fast_encode=fast_encode,
+                )
+            else:
+                processor.scale_video_cpu(
+                    str(input_path), str(output_path),
+                    total_frames=total_frames,
+                    reporter=reporter,
+                    xaxis=width, yaxis=height,
+                    crf=crf, preset=preset, threads=threads,
+                    input_duration=duration, input_fps=fps,
+                    fast_encode=fast_encode,
+                )
+        finally:
+            processors.put(processor)
             
-        if success:
+        if os.path.exists(output_path):
             print(f"Moving {input_path.name} to original_files/")
             shutil.move(str(input_path), str(orig_dir / input_path.name))
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(compress_one, files_to_process, infos))
 
 def join_videos(args):
     config = get_config_manager()
@@ -143,18 +164,14 @@ def join_videos(args):
         print("Error: Videos have different properties and can't be joined.")
         return
     
-    # Create concat file in .incoming
-    concat_file = joiner.create_concat_file(video_files, str(INCOMING_DIR))
-    
     from models.constants import JOINED_OUTPUT_FILENAME
     output_file = str(action_dir / JOINED_OUTPUT_FILENAME)
     
     print(f"Joining videos into: {output_file}")
-    joiner.join_videos(concat_file, output_file, total_files, reporter=PrintProgressReporter())
-    
-    # Clean up concat file
-    if os.path.exists(concat_file):
-        os.remove(concat_file)
+    joiner.join_files(
+        video_files, output_file, reporter=PrintProgressReporter(),
+        total_duration=joiner.get_total_duration(video_files),
+    )
         
     if os.path.exists(output_file):
         print("Moving original files to original_files/")
@@ -177,6 +194,18 @@ def main():
     comp_parser.add_argument("--resolution", choices=["HD", "FHD", "4K"], help="Output resolution")
     comp_parser.add_argument("--gpu", action="store_true", default=None, help="Force GPU encoding")
     comp_parser.add_argument("--cpu", action="store_false", dest="gpu", help="Force CPU encoding")
+    comp_parser.add_argument(
+        "--exact-frames", action="store_true",
+        help="Count frames exactly before encoding (slow; for accurate progress on VFR sources)",
+    )
+    comp_parser.add_argument(
+        "--no-fast-encode", action="store_false", dest="fast_encode", default=None,
+        help="Skip fast encode tuning (shorter x264 lookahead, web-optimized MP4)",
+    )
+    comp_parser.add_argument(
+        "--copy-matching", action="store_true",
+        help="Copy H.264 files already at the target resolution instead of re-encoding (ignores --crf/--preset)",
+    )
     
     # Join command
     subparsers.add_parser("join", help="Join videos in .incoming/ into one file")
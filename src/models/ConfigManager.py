@@ -63,7 +63,8 @@ class ConfigManager:
                 "use_gpu": False,
                 "use_all_cores": False,
                 "cpu_cores": 0,
-                "cap_cpu_50": False
+                "cap_cpu_50": False,
+                "fast_encode": True
             },
             "video": {
                 "target_fps": None
@@ -178,13 +179,16 @@ class ConfigManager:
             perf.get("use_all_cores", False)
         )
     
-    def set_performance_settings(self, use_gpu: bool, use_all_cores: bool, cap_cpu_50: bool = False) -> None:
+    def set_performance_settings(
+        self, use_gpu: bool, use_all_cores: bool, cap_cpu_50: bool = False, fast_encode: bool = True
+    ) -> None:
         """Set performance settings."""
         if "performance" not in self.config:
             self.config["performance"] = {}
         self.config["performance"]["use_gpu"] = use_gpu
         self.config["performance"]["use_all_cores"] = use_all_cores
         self.config["performance"]["cap_cpu_50"] = cap_cpu_50
+        self.config["performance"]["fast_encode"] = fast_encode
         self._save_config()
     
     def get_cpu_cap_setting(self) -> bool:
@@ -192,6 +196,11 @@ class ConfigManager:
         perf = self.config.get("performance", {})
         return perf.get("cap_cpu_50", False)
     
+    def get_fast_encode_setting(self) -> bool:
+        """Get fast encode tuning setting."""
+        perf = self.config.get("performance", {})
+        return perf.get("fast_encode", True)
+    
     def set_target_fps(self, target_fps: Optional[float]) -> None:
         """Set target FPS setting."""
         if "video" not in self.config:
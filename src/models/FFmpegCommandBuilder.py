@@ -3,17 +3,53 @@ FFmpegCommandBuilder class for constructing FFmpeg commands.
 """
 
 from typing import List, Optional
-from utils.ffmpeg_paths import get_ffmpeg_exe
+from utils.ffmpeg_paths import VAAPI_RENDER_NODE, get_ffmpeg_exe
 from .constants import (
-    HD_WIDTH, HD_HEIGHT, FHD_WIDTH, FHD_HEIGHT, UHD_4K_WIDTH, UHD_4K_HEIGHT,
+    HD_WIDTH, HD_HEIGHT,
     DEFAULT_CRF, DEFAULT_PRESET, DEFAULT_AUDIO_CODEC, DEFAULT_AUDIO_BITRATE,
-    CPU_CODEC, GPU_CODEC
+    CPU_CODEC, GPU_CODEC, PROGRESS_STATS_PERIOD, FFMPEG_LOG_ARGS,
+    FAST_ENCODE_X264_PARAMS, FASTSTART_EXTENSIONS,
+    NVENC_PRESET_MAP, X264_MAX_THREADS,
+)
+
+# Shared tail of every command: progress on stdout, no stderr stats, overwrite output
+_PROGRESS_ARGS = (
+    "-progress", "pipe:1",
+    "-stats_period", PROGRESS_STATS_PERIOD,
+    "-nostats",
+    "-y",
 )
 
 
 class FFmpegCommandBuilder:
     """Builds FFmpeg commands for video processing operations."""
     
+    @staticmethod
+    def _faststart_args(output_file: str) -> List[str]:
+        """Move the moov atom to the front so MP4/MOV output is web-streamable."""
+        if output_file.lower().endswith(FASTSTART_EXTENSIONS):
+            return ["-movflags", "+faststart"]
+        return []
+    
+    @staticmethod
+    def _hw_encoder_args(video_codec: str, crf: str, preset: str) -> List[str]:
+        """Quality/preset flags for a hardware encoder, translated from CRF and x264 preset names."""
+        if "nvenc" in video_codec:
+            # -b:v 0 lifts the default 2 Mb/s VBR target so -cq alone sets quality
+            return ["-rc", "vbr", "-cq", crf, "-b:v", "0", "-preset", NVENC_PRESET_MAP.get(preset, preset)]
+        if "qsv" in video_codec:
+            # QSV has no ultrafast/superfast; veryfast is its quickest named preset
+            qsv_preset = "veryfast" if preset in ("ultrafast", "superfast") else preset
+            return ["-global_quality", crf, "-preset", qsv_preset]
+        if "amf" in video_codec:
+            return ["-rc", "cqp", "-qp_i", crf, "-qp_p", crf]
+        if "vaapi" in video_codec:
+            return ["-rc_mode", "CQP", "-qp", crf]
+        if "videotoolbox" in video_codec:
+            # VideoToolbox quality runs 1-100, higher is better; CRF 0-51 runs the other way
+            return ["-q:v", str(max(1, min(100, 100 - 2 * int(crf))))]
+        return ["-crf", crf, "-preset", preset]
+    
     @staticmethod
     def build_scale_command_cpu(
         input_file: str,
@@ -26,7 +62,9 @@ class FFmpegCommandBuilder:
         video_codec: str = CPU_CODEC,
         audio_codec: str = DEFAULT_AUDIO_CODEC,
         audio_bitrate: str = DEFAULT_AUDIO_BITRATE,
-        fps: Optional[float] = None
+        fps: Optional[float] = None,
+        fast_encode: bool = False,
+        use_zscale: bool = False
     ) -> List[str]:
         """Build FFmpeg command for CPU-based video scaling.
         
@@ -39,12 +77,17 @@ class FFmpegCommandBuilder:
             preset: Encoding preset
             threads: Number of threads (0 = auto)
             fps: Target FPS (None to keep current)
+            fast_encode: Shorten x264 lookahead and add MP4 faststart
+            use_zscale: Resize with zscale (libzimg, SIMD) instead of swscale
             
         Returns:
             List of command arguments
         """
         # Build video filter with scale
-        vf_parts = [f"scale={xaxis}:{yaxis}"]
+        if use_zscale:
+            vf_parts = [f"zscale=w={xaxis}:h={yaxis}:f=lanczos"]
+        else:
+            vf_parts = [f"scale={xaxis}:{yaxis}"]
         
         # Add FPS filter if specified
         if fps is not None:
@@ -52,25 +95,29 @@ class FFmpegCommandBuilder:
         
         vf_string = ",".join(vf_parts)
         
+        if video_codec == "libx264":
+            # x264's frame threads stop paying off past this; more only add lookahead lag
+            threads = min(threads, X264_MAX_THREADS)
+        
         cmd = [
-            get_ffmpeg_exe(), "-i", input_file,
+            get_ffmpeg_exe(), *FFMPEG_LOG_ARGS, "-i", input_file,
             "-vf", vf_string,
             "-c:v", video_codec,
+            # 0 leaves the choice to ffmpeg, so the flag is left out entirely
+            *(("-threads", str(threads)) if threads > 0 else ()),
             "-crf", crf,
             "-preset", preset,
+        ]
+        if fast_encode:
+            if video_codec == "libx264":
+                cmd += ["-x264-params", FAST_ENCODE_X264_PARAMS]
+            cmd += FFmpegCommandBuilder._faststart_args(output_file)
+        cmd += [
             "-c:a", audio_codec,
             "-b:a", audio_bitrate,
-            "-progress", "pipe:1",
-            "-nostats",
-            "-y",  # Overwrite output file
+            *_PROGRESS_ARGS,
             output_file
         ]
-        
-        if threads > 0:
-            # Insert threads parameter after codec
-            cmd.insert(cmd.index("-c:v") + 2, "-threads")
-            cmd.insert(cmd.index("-threads") + 1, str(threads))
-        
         return cmd
     
     @staticmethod
@@ -84,9 +131,15 @@ class FFmpegCommandBuilder:
         video_codec: str = GPU_CODEC,
         audio_codec: str = DEFAULT_AUDIO_CODEC,
         audio_bitrate: str = DEFAULT_AUDIO_BITRATE,
-        fps: Optional[float] = None
+        fps: Optional[float] = None,
+        fast_encode: bool = False,
+        use_npp: bool = False
     ) -> List[str]:
-        """Build FFmpeg command for GPU-based video scaling (NVENC).
+        """Build FFmpeg command for hardware-encoded video scaling.
+        
+        NVENC keeps decode and scaling on the GPU (CUDA frames, scale_cuda);
+        VAAPI uploads decoded frames once and scales with scale_vaapi; other
+        hardware encoders scale in software and encode on the device.
         
         Args:
             input_file: Input video file path
@@ -94,36 +147,67 @@ class FFmpegCommandBuilder:
             xaxis: Output width
             yaxis: Output height
             crf: Constant Rate Factor (quality setting)
-            preset: Encoding preset
+            preset: Encoding preset (x264 names are translated per encoder)
+            video_codec: Hardware encoder, e.g. h264_nvenc or h264_qsv
             fps: Target FPS (None to keep current)
+            fast_encode: Add MP4 faststart
+            use_npp: Scale CUDA frames with scale_npp (builds without scale_cuda)
             
         Returns:
             List of command arguments
         """
         # Build video filter with scale
-        if "nvenc" in video_codec:
-            vf_parts = [f"scale_cuda={xaxis}:{yaxis}"]
+        is_nvenc = "nvenc" in video_codec
+        is_vaapi = "vaapi" in video_codec
+        vf_parts = []
+        if is_nvenc:
+            vf_parts.append(f"{'scale_npp' if use_npp else 'scale_cuda'}={xaxis}:{yaxis}")
+        elif is_vaapi:
+            vf_parts += ["format=nv12", "hwupload", f"scale_vaapi={xaxis}:{yaxis}"]
         else:
-            vf_parts = [f"scale={xaxis}:{yaxis}"]
+            vf_parts.append(f"scale={xaxis}:{yaxis}")
         
         # Add FPS filter if specified
         if fps is not None:
-            vf_parts.append(f"fps={fps}")
+            vf_parts.insert(0 if is_vaapi else len(vf_parts), f"fps={fps}")
         
         vf_string = ",".join(vf_parts)
         
+        if is_nvenc:
+            hwaccel = ["-hwaccel", "cuda", "-hwaccel_output_format", "cuda"]
+        elif is_vaapi:
+            hwaccel = ["-vaapi_device", VAAPI_RENDER_NODE]
+        else:
+            hwaccel = []
         return [
-            get_ffmpeg_exe(), "-hwaccel", "cuda", "-hwaccel_output_format", "cuda",
+            get_ffmpeg_exe(), *FFMPEG_LOG_ARGS, *hwaccel,
             "-i", input_file,
             "-vf", vf_string,
             "-c:v", video_codec,
-            "-cq", crf,
-            "-preset", preset,
+            *FFmpegCommandBuilder._hw_encoder_args(video_codec, crf, preset),
+            *(FFmpegCommandBuilder._faststart_args(output_file) if fast_encode else []),
             "-c:a", audio_codec,
             "-b:a", audio_bitrate,
-            "-progress", "pipe:1",
-            "-nostats",
-            "-y",  # Overwrite output file
+            *_PROGRESS_ARGS,
+            output_file
+        ]
+    
+    @staticmethod
+    def build_remux_command(input_file: str, output_file: str) -> List[str]:
+        """Build FFmpeg command that copies all streams without re-encoding.
+        
+        Args:
+            input_file: Input video file path
+            output_file: Output video file path
+            
+        Returns:
+            List of command arguments
+        """
+        return [
+            get_ffmpeg_exe(), *FFMPEG_LOG_ARGS, "-i", input_file,
+            "-c", "copy",
+            *FFmpegCommandBuilder._faststart_args(output_file),
+            *_PROGRESS_ARGS,
             output_file
         ]
     
@@ -132,18 +216,20 @@ class FFmpegCommandBuilder:
         """Build FFmpeg command for joining videos using concat demuxer.
         
         Args:
-            concat_file: Path to concat list file
+            concat_file: Path to concat list file, or "pipe:0" to read it from stdin
             output_file: Output video file path
             
         Returns:
             List of command arguments
         """
-        return [
-            get_ffmpeg_exe(), "-f", "concat", "-safe", "0", "-i", concat_file,
+        cmd = [get_ffmpeg_exe(), *FFMPEG_LOG_ARGS, "-f", "concat", "-safe", "0"]
+        if concat_file.startswith("pipe:"):
+            # The list itself arrives over a pipe; entries are still local files
+            cmd += ["-protocol_whitelist", "file,pipe"]
+        return cmd + [
+            "-i", concat_file,
             "-c", "copy",
-            "-progress", "pipe:1",
-            "-nostats",
-            "-y",  # Overwrite output file
+            *_PROGRESS_ARGS,
             output_file
         ]
 
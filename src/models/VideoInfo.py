@@ -2,15 +2,131 @@
 VideoInfo class for extracting video metadata using ffprobe.
 """
 
+import atexit
+import functools
+import json
+import os
 import subprocess
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
+from utils.core_functions import available_cores
 from utils.ffmpeg_paths import get_ffprobe_exe, subprocess_env
+from .constants import (
+    HEADER_PROBE_EXTENSIONS, PROBE_CACHE_FILENAME, PROBE_CACHE_SIZE, PROBE_MAX_WORKERS,
+)
+from .container_probe import probe_mp4
 
 logger = logging.getLogger(__name__)
 
+_disk_cache: Optional[Dict[str, str]] = None
+_disk_cache_dirty = False
+_disk_cache_lock = threading.Lock()
+
+
+def _probe_workers(count: int) -> int:
+    """Number of threads to use for probing `count` files concurrently."""
+    return max(1, min(count, PROBE_MAX_WORKERS, available_cores() * 2))
+
+
+def _probe_cache_path() -> Optional[Path]:
+    try:
+        from utils.core_functions import get_data_path
+        return Path(get_data_path(PROBE_CACHE_FILENAME))
+    except (ImportError, OSError):
+        return None
+
+
+def _get_disk_cache() -> Dict[str, str]:
+    """Load persisted ffprobe results once per process."""
+    global _disk_cache
+    with _disk_cache_lock:
+        if _disk_cache is None:
+            _disk_cache = {}
+            path = _probe_cache_path()
+            if path and path.is_file():
+                try:
+                    loaded = json.loads(path.read_text(encoding="utf-8"))
+                    if isinstance(loaded, dict):
+                        _disk_cache = loaded
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Could not read probe cache: {e}")
+            atexit.register(save_probe_cache)
+        return _disk_cache
+
+
+def save_probe_cache() -> bool:
+    """Persist ffprobe results, dropping entries for files that changed or vanished."""
+    global _disk_cache_dirty
+    with _disk_cache_lock:
+        if _disk_cache is None or not _disk_cache_dirty:
+            return True
+        path = _probe_cache_path()
+        if path is None:
+            return False
+        live = {}
+        for key, output in _disk_cache.items():
+            try:
+                video_path, size, mtime_ns, _args = json.loads(key)
+                st = os.stat(video_path)
+            except (OSError, ValueError):
+                continue
+            if (st.st_size, st.st_mtime_ns) == (size, mtime_ns):
+                live[key] = output
+        # Write then rename so a crash mid-save can't leave a truncated cache
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            tmp_path.write_text(json.dumps(live), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not save probe cache: {e}")
+            return False
+        _disk_cache_dirty = False
+        return True
+
+
+# ffprobe can't stay resident between inputs, so keep each launch cheap: on
+# Windows skip allocating a console host for every probe.
+_PROBE_CREATIONFLAGS = getattr(subprocess, "CREATE_NO_WINDOW", 0) if os.name == "nt" else 0
+
+
+@functools.lru_cache(maxsize=PROBE_CACHE_SIZE)
+def _ffprobe_output(path: str, size: int, mtime_ns: int, args: Tuple[str, ...]) -> str:
+    """ffprobe stdout for an unchanged file; size and mtime make stale entries miss."""
+    global _disk_cache_dirty
+    key = json.dumps([path, size, mtime_ns, list(args)])
+    disk_cache = _get_disk_cache()
+    if key in disk_cache:
+        return disk_cache[key]
+    output = _run_ffprobe_uncached(path, args)
+    with _disk_cache_lock:
+        disk_cache[key] = output
+        _disk_cache_dirty = True
+    return output
+
+
+def _run_ffprobe_uncached(path: str, args: Sequence[str]) -> str:
+    cmd = [get_ffprobe_exe(), *args, path]
+    result = subprocess.run(
+        cmd, capture_output=True, check=True,
+        env=subprocess_env(), creationflags=_PROBE_CREATIONFLAGS,
+    )
+    # ffprobe writes UTF-8 JSON; decode it directly rather than through the
+    # locale codec and newline translation that text=True would apply
+    return result.stdout.decode("utf-8", "replace")
+
+
+def _run_ffprobe(path: str, args: Sequence[str]) -> str:
+    """Run ffprobe with `args` on `path`, reusing results for unchanged files."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return _run_ffprobe_uncached(path, args)
+    return _ffprobe_output(path, st.st_size, st.st_mtime_ns, tuple(args))
+
 
 class VideoInfo:
     """Handles video metadata extraction and information retrieval.
@@ -34,6 +150,7 @@ class VideoInfo:
         self.codec: Optional[str] = None
         self.framerate: Optional[str] = None  # Raw framerate string from ffprobe
         self.total_frames: Optional[int] = None
+        self.duration: Optional[float] = None
         self.status_done: Optional[str] = None
         
         # User selections - encoding settings
@@ -66,22 +183,18 @@ class VideoInfo:
         """
         self.video_path = video_path
         
-        # Extract codec and framerate
-        video_info = self._extract_video_info(video_path)
-        if video_info:
-            self.codec, self.width, self.height, self.framerate = video_info
+        # Extract codec, resolution, framerate and duration in one ffprobe call
+        probe = self._extract_probe(video_path)
+        if probe:
+            self.codec, self.width, self.height, self.framerate, self.duration, self.total_frames = probe
             if self.width < self.height:
                 self.is_vertical = True
                 self.orientation = "_vertical"
             else:
                 self.is_vertical = False
                 self.orientation = "_horizontal"
-            # Use width/height from video_info if fps_info didn't work
             self.fps = self._parse_framerate(self.framerate) if self.framerate else None
         
-        # Extract total frames
-        self.total_frames = self._extract_total_frames(video_path)
-        
         return self.fps is not None and self.width is not None and self.height is not None
     
     def _parse_framerate(self, framerate_str: str) -> Optional[float]:
@@ -102,37 +215,77 @@ class VideoInfo:
         except (ValueError, ZeroDivisionError):
             return None
     
-    def _extract_fps_and_size(self, video_path: str) -> Optional[Tuple[float, int, int]]:
-        """Extract FPS and video dimensions using ffprobe.
+    def _extract_probe(
+        self, video_path: str
+    ) -> Optional[Tuple[str, int, int, str, Optional[float], Optional[int]]]:
+        """Extract codec, resolution, framerate, duration and frame count with a single ffprobe call.
+        
+        ffprobe only accepts one input per invocation, so this is the cheapest
+        per-file probe; callers batch files with probe_many() instead.
+        
+        The frame count is the container's nb_frames when it records one, which
+        is exact for VFR sources; otherwise duration * avg_frame_rate.
+        MP4/MOV files are read straight from their moov header when possible.
         
         Args:
             video_path: Path to the video file
             
         Returns:
-            Tuple of (fps, width, height) or None if extraction fails
+            Tuple of (codec, width, height, framerate, duration, total_frames) or None if extraction fails
         """
+        if video_path.lower().endswith(HEADER_PROBE_EXTENSIONS):
+            header = probe_mp4(video_path)
+            if header is not None:
+                return header
         try:
-            cmd = [
-                get_ffprobe_exe(), "-v", "error",
+            output = _run_ffprobe(video_path, [
+                "-v", "error",
                 "-select_streams", "v:0",
-                "-show_entries", "stream=width,height,r_frame_rate",
-                "-of", "default=noprint_wrappers=1:nokey=1",
-                video_path
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True, env=subprocess_env())
-            lines = result.stdout.strip().splitlines()
-            width = int(lines[0])
-            height = int(lines[1])
-            framerate_str = lines[2]
-            
-            fps = self._parse_framerate(framerate_str)
-            if fps is None:
-                return None
-            
-            return fps, width, height
+                "-show_entries",
+                "stream=codec_name,width,height,r_frame_rate,avg_frame_rate,nb_frames:format=duration",
+                "-of", "json",
+            ])
+            data = json.loads(output)
+            stream = data["streams"][0]
+            duration = data.get("format", {}).get("duration")
+            duration = float(duration) if duration not in (None, "N/A") else None
+            nb_frames = stream.get("nb_frames")
+            if nb_frames and nb_frames.isdigit() and int(nb_frames) > 0:
+                total_frames = int(nb_frames)
+            else:
+                avg_fps = self._parse_framerate(stream.get("avg_frame_rate") or "")
+                if not avg_fps:
+                    avg_fps = self._parse_framerate(stream["r_frame_rate"])
+                total_frames = int(duration * avg_fps) if duration and avg_fps else None
+            return (
+                stream["codec_name"],
+                int(stream["width"]),
+                int(stream["height"]),
+                stream["r_frame_rate"],
+                duration,
+                total_frames,
+            )
         except Exception as e:
-            logger.error(f"Error getting FPS and size for {video_path}: {e}")
+            logger.error(f"Error probing {video_path}: {e}")
+            return None
+    
+    def _extract_fps_and_size(self, video_path: str) -> Optional[Tuple[float, int, int]]:
+        """Extract FPS and video dimensions using ffprobe.
+        
+        Args:
+            video_path: Path to the video file
+            
+        Returns:
+            Tuple of (fps, width, height) or None if extraction fails
+        """
+        probe = self._extract_probe(video_path)
+        if not probe:
+            return None
+        _codec, width, height, framerate, _duration, _frames = probe
+        fps = self._parse_framerate(framerate)
+        if fps is None:
             return None
+        return fps, width, height
     
     def _extract_video_info(self, video_path: str) -> Optional[Tuple[str, int, int, str]]:
         """Extract codec, resolution, and framerate using ffprobe.
@@ -143,20 +296,8 @@ class VideoInfo:
         Returns:
             Tuple of (codec, width, height, framerate) or None if extraction fails
         """
-        try:
-            cmd = [
-                get_ffprobe_exe(), "-v", "error",
-                "-select_streams", "v:0",
-                "-show_entries", "stream=codec_name,width,height,r_frame_rate",
-                "-of", "default=noprint_wrappers=1:nokey=1",
-                video_path
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True, env=subprocess_env())
-            codec, width, height, framerate = result.stdout.strip().splitlines()
-            return codec, int(width), int(height), framerate
-        except Exception as e:
-            logger.error(f"Error getting video info for {video_path}: {e}")
-            return None
+        probe = self._extract_probe(video_path)
+        return probe[:4] if probe else None
     
     def _extract_total_frames(self, video_path: str) -> Optional[int]:
         """Extract video duration and FPS using ffprobe to calculate total frames.
@@ -167,27 +308,12 @@ class VideoInfo:
         Returns:
             Total number of frames, or None if extraction fails
         """
-        try:
-            cmd = [
-                get_ffprobe_exe(),
-                "-v", "error",
-                "-show_entries", "format=duration:stream=r_frame_rate",
-                "-of", "default=noprint_wrappers=1:nokey=1",
-                video_path
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True, env=subprocess_env())
-            output_lines = result.stdout.strip().splitlines()
-            if len(output_lines) > 2:
-                duration_str = output_lines[-1]
-            else:
-                duration_str = output_lines[1]
-            fps_str = output_lines[0].split("/")[0]
-            if int(fps_str) == 0:
-                fps_str = output_lines[1].split("/")[0]
-            return int(int(float(duration_str)) * int(fps_str))
-        except (subprocess.CalledProcessError, FileNotFoundError, ValueError, IndexError) as e:
-            logger.error(f"Error getting total frames for {video_path}: {e}")
+        probe = self._extract_probe(video_path)
+        if not probe:
             return None
+        if probe[5] is None:
+            logger.error(f"Error getting total frames for {video_path}: missing duration or frame rate")
+        return probe[5]
     
     def get_duration(self, video_path: Optional[str] = None) -> Optional[float]:
         """Get video duration in seconds.
@@ -201,23 +327,43 @@ class VideoInfo:
         path = video_path or self.video_path
         if not path:
             return None
+        if self.duration is not None and path == self.video_path:
+            return self.duration
+        
+        probe = self._extract_probe(path)
+        return probe[4] if probe else None
+    
+    def count_frames(self, video_path: Optional[str] = None) -> Optional[int]:
+        """Count video frames exactly by reading every packet (ffprobe -count_packets).
+        
+        Much slower than get_total_frames(); only worth it when the container has
+        no frame count and the source is variable frame rate. The result replaces
+        the stored estimate.
         
+        Args:
+            video_path: Optional path to video file (uses self.video_path if not provided)
+            
+        Returns:
+            Exact number of frames, or None if counting fails
+        """
+        path = video_path or self.video_path
+        if not path:
+            return None
         try:
-            cmd = [
-                get_ffprobe_exe(),
+            output = _run_ffprobe(path, [
                 "-v", "error",
-                "-show_entries", "format=duration",
-                "-of", "default=noprint_wrappers=1:nokey=1",
-                path
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True, env=subprocess_env())
-            duration_str = result.stdout.strip()
-            if duration_str:
-                return float(duration_str)
-            return None
-        except (subprocess.CalledProcessError, FileNotFoundError, ValueError) as e:
-            logger.error(f"Error getting duration for {path}: {e}")
+                "-select_streams", "v:0",
+                "-count_packets",
+                "-show_entries", "stream=nb_read_packets",
+                "-of", "json",
+            ])
+            frames = int(json.loads(output)["streams"][0]["nb_read_packets"])
+        except Exception as e:
+            logger.error(f"Error counting frames for {path}: {e}")
             return None
+        if path == self.video_path:
+            self.total_frames = frames
+        return frames
     
     # Convenience methods for backward compatibility and easy access
     def get_total_frames(self, video_path: Optional[str] = None) -> Optional[int]:
@@ -378,21 +524,38 @@ class VideoInfo:
         """
         if not video_files:
             return False
-        
-        # Create VideoInfo instance for reference video
-        reference_video_info = VideoInfo(video_files[0])
-        reference_info = reference_video_info.get_video_info()
-        if not reference_info:
-            return False
 
-        # Check all other videos against reference
-        for video in video_files[1:]:
-            video_info = VideoInfo(video)
-            info = video_info.get_video_info()
-            if info != reference_info:
+        # Probe every file concurrently; each probe is its own ffprobe process
+        executor = ThreadPoolExecutor(max_workers=_probe_workers(len(video_files)))
+        try:
+            infos = executor.map(lambda path: VideoInfo(path).get_video_info(), video_files)
+            reference_info = next(infos)
+            if not reference_info:
                 return False
 
-        return True
+            # Check all other videos against reference
+            for info in infos:
+                if info != reference_info:
+                    return False
+
+            return True
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def probe_many(video_files: List[str]) -> List["VideoInfo"]:
+        """Load VideoInfo for several files concurrently.
+        
+        Args:
+            video_files: List of video file paths
+            
+        Returns:
+            VideoInfo objects in the same order as video_files
+        """
+        if not video_files:
+            return []
+        with ThreadPoolExecutor(max_workers=_probe_workers(len(video_files))) as executor:
+            return list(executor.map(VideoInfo, video_files))
     
     @staticmethod
     def sanitize_path(file_path: str) -> Optional[str]:
@@ -5,21 +5,22 @@ VideoJoiner class for joining multiple video files.
 import os
 import subprocess
 import time
-import re
 import logging
 from typing import List, Optional
 
-from utils.ffmpeg_paths import subprocess_env
+from utils.ffmpeg_paths import can_posix_spawn, subprocess_env
 from .VideoInfo import VideoInfo
 from .FFmpegCommandBuilder import FFmpegCommandBuilder
 from .progress_reporter import ProgressReporter, get_reporter
 from .constants import (
-    SUPPORTED_VIDEO_FORMATS, JOINED_OUTPUT_FILENAME, CONCAT_LIST_FILENAME,
-    PROCESS_TERMINATION_TIMEOUT,
+    SUPPORTED_VIDEO_EXTENSIONS, CONCAT_LIST_FILENAME,
+    CONCAT_LIST_STDIN, PROCESS_TERMINATION_TIMEOUT,
 )
 
 logger = logging.getLogger(__name__)
 
+_OUT_TIME_PREFIX = b"out_time_us="
+
 
 class VideoJoiner:
     """Handles joining multiple video files into one."""
@@ -37,25 +38,47 @@ class VideoJoiner:
             except Exception as e:
                 logger.error(f"Error terminating process: {e}")
 
-    def _average_list(self, my_list: List[float]) -> float:
-        return sum(my_list) / len(my_list) if my_list else 0
+    @staticmethod
+    def _concat_line(video: str) -> str:
+        abs_path = os.path.abspath(video)
+        normalized_path = abs_path.replace("\\", "/")
+        escaped_path = normalized_path.replace("'", "'\\''")
+        return f"file '{escaped_path}'\n"
+
+    @classmethod
+    def _concat_list(cls, video_files: List[str]) -> str:
+        return "".join(cls._concat_line(video) for video in video_files)
 
     def create_concat_file(self, video_files: List[str], folder_path: str) -> str:
         concat_file = os.path.join(folder_path, CONCAT_LIST_FILENAME).replace("\\", "/")
         with open(concat_file, "w", encoding="utf-8") as f:
-            for video in video_files:
-                abs_path = os.path.abspath(video)
-                normalized_path = abs_path.replace("\\", "/")
-                escaped_path = normalized_path.replace("'", "'\\''")
-                f.write(f"file '{escaped_path}'\n")
+            f.write(self._concat_list(video_files))
         return concat_file
 
+    def join_files(
+        self,
+        video_files: List[str],
+        output_file: str,
+        reporter: Optional[ProgressReporter] = None,
+        total_duration: Optional[float] = None,
+    ) -> bool:
+        """Join video_files, feeding the concat list to FFmpeg over stdin.
+
+        Avoids writing concat_list.txt next to the inputs (which may be read-only).
+        """
+        return self.join_videos(
+            CONCAT_LIST_STDIN, output_file, len(video_files), reporter=reporter,
+            total_duration=total_duration, concat_list=self._concat_list(video_files),
+        )
+
     def join_videos(
         self,
         concat_file: str,
         output_file: str,
         total_files: int,
         reporter: Optional[ProgressReporter] = None,
+        total_duration: Optional[float] = None,
+        concat_list: Optional[str] = None,
     ) -> bool:
         rep = get_reporter(reporter)
         self._cancel_requested = False
@@ -63,30 +86,34 @@ class VideoJoiner:
 
         try:
             startupinfo = None
+            creationflags = 0
             if os.name == "nt":
                 startupinfo = subprocess.STARTUPINFO()
                 startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+                creationflags = subprocess.CREATE_NO_WINDOW
 
             process = subprocess.Popen(
                 ffmpeg_cmd,
+                stdin=subprocess.PIPE if concat_list is not None else None,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
                 startupinfo=startupinfo,
+                creationflags=creationflags,
+                close_fds=not can_posix_spawn(ffmpeg_cmd),
                 env=subprocess_env(),
             )
             self._current_process = process
+            if concat_list is not None:
+                process.stdin.write(concat_list.encode("utf-8"))
+                process.stdin.close()
             rep.on_log("\nStarting FFmpeg to join videos...\n")
             rep.on_log(f"[0/{total_files}] Progress: Starting...\n")
 
             start_time = time.perf_counter()
-            avg_time_diff = [0.0] * 10
-            i = 0
+            total_us = total_duration * 1_000_000 if total_duration else None
             last_progress_msg = ""
 
-            for line in process.stdout:
+            for line in iter(process.stdout.readline, b""):
                 if self._cancel_requested:
                     process.terminate()
                     try:
@@ -103,20 +130,36 @@ class VideoJoiner:
                             pass
                     return False
 
-                match = re.search(r"frame=\s*(\d+)", line)
-                if match:
-                    now = time.perf_counter()
-                    elapsed = now - start_time
-                    avg_time_diff[i] = elapsed
-                    estimated_total_time = self._average_list(avg_time_diff) * total_files
-                    elapsed_total_time = now - start_time
-                    percentage = (elapsed_total_time / estimated_total_time) * 100 if estimated_total_time else 0
-                    i = (i + 1) % 10
-                    progress_message = f"[~/{total_files}] Progress: {percentage:.2f}% elapsed."
+                if line.startswith(_OUT_TIME_PREFIX):
+                    try:
+                        out_time_us = int(line[len(_OUT_TIME_PREFIX):])
+                    except ValueError:
+                        continue  # "N/A" before the first packet is written
+                    if not total_us:
+                        # An input didn't probe: show how much has been joined, without a percentage
+                        minutes, seconds = divmod(out_time_us // 1_000_000, 60)
+                        hours, minutes = divmod(minutes, 60)
+                        progress_message = (
+                            f"[{total_files} files] Joined: {hours:02}:{minutes:02}:{seconds:02} (total length unknown)"
+                        )
+                        if progress_message != last_progress_msg:
+                            last_progress_msg = progress_message
+                            rep.on_progress({"message": progress_message})
+                        continue
+                    percentage = min(100.0, out_time_us / total_us * 100)
+                    elapsed = time.perf_counter() - start_time
+                    remaining = int(elapsed * (100 - percentage) / percentage) if percentage > 0 else 0
+                    minutes, seconds = divmod(remaining, 60)
+                    hours, minutes = divmod(minutes, 60)
+                    rem_str = f"{hours:02}:{minutes:02}:{seconds:02}"
+                    progress_message = f"[{total_files} files] Progress: {percentage:.2f}% - Remaining: {rem_str}"
                     if progress_message != last_progress_msg:
                         last_progress_msg = progress_message
-                        rep.on_log(progress_message + "\n")
-                        rep.on_progress({"percent": percentage, "message": progress_message})
+                        rep.on_progress({
+                            "percent": percentage,
+                            "time_remaining": rem_str,
+                            "message": progress_message,
+                        })
 
             process.wait()
             self._current_process = None
@@ -142,9 +185,18 @@ class VideoJoiner:
             logger.error(f"Error during join: {e}")
             return False
 
+    def get_total_duration(self, video_files: List[str]) -> Optional[float]:
+        """Combined duration of video_files in seconds, or None if any probe fails."""
+        durations = [vi.get_duration() for vi in VideoInfo.probe_many(video_files)]
+        if not durations or any(d is None for d in durations):
+            return None
+        return sum(durations)
+
     def get_video_files(self, folder_path: str) -> List[str]:
-        return sorted([
-            os.path.join(folder_path, f).replace("\\", "/")
-            for f in os.listdir(folder_path)
-            if f.lower().endswith(SUPPORTED_VIDEO_FORMATS)
-        ])
+        with os.scandir(folder_path) as entries:
+            return sorted([
+                os.path.join(folder_path, entry.name).replace("\\", "/")
+                for entry in entries
+                if entry.name.rpartition(".")[2].lower() in SUPPORTED_VIDEO_EXTENSIONS
+                and entry.is_file()
+            ])
@@ -2,20 +2,22 @@
 VideoProcessor class for handling video encoding operations.
 """
 
+import signal
 import subprocess
-import re
 import time
 import os
 import logging
-from typing import List, Tuple, Optional
-from threading import Thread
+from collections import deque
+from typing import Deque, List, Tuple, Optional
 
-from utils.ffmpeg_paths import subprocess_env
+from utils.ffmpeg_paths import available_filters, can_posix_spawn, detect_hw_encoder, subprocess_env
 from .FFmpegCommandBuilder import FFmpegCommandBuilder
 from .progress_reporter import ProgressReporter, get_reporter
 from .constants import (
     PROCESS_TERMINATION_TIMEOUT,
-    HD_WIDTH, HD_HEIGHT, DEFAULT_CRF, DEFAULT_PRESET
+    HD_WIDTH, HD_HEIGHT, DEFAULT_CRF, DEFAULT_PRESET, REMUX_CODECS, GPU_CODEC,
+    ENCODER_NICENESS, MAX_PARALLEL_ENCODES, MAX_PARALLEL_HW_ENCODES,
+    MAX_ERROR_LINES,
 )
 
 logger = logging.getLogger(__name__)
@@ -37,6 +39,33 @@ class VideoProcessor:
             except Exception as e:
                 logger.error(f"Error terminating process: {e}")
 
+    @staticmethod
+    def _start_ffmpeg(ffmpeg_cmd: List[str]) -> subprocess.Popen:
+        """Start an encode at below-normal priority so the UI stays responsive."""
+        startupinfo = None
+        creationflags = 0
+        if os.name == "nt":
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            creationflags = subprocess.BELOW_NORMAL_PRIORITY_CLASS | subprocess.CREATE_NO_WINDOW
+
+        process = subprocess.Popen(
+            ffmpeg_cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            startupinfo=startupinfo,
+            creationflags=creationflags,
+            close_fds=not can_posix_spawn(ffmpeg_cmd),
+            env=subprocess_env(),
+        )
+        if hasattr(os, "setpriority"):
+            # Not preexec_fn: it isn't safe with the parallel encode threads
+            try:
+                os.setpriority(os.PRIO_PROCESS, process.pid, ENCODER_NICENESS)
+            except OSError as e:
+                logger.debug(f"Could not lower FFmpeg priority: {e}")
+        return process
+
     def _log(self, reporter: ProgressReporter, message: str) -> None:
         reporter.on_log(message if message.endswith("\n") else message + "\n")
 
@@ -50,8 +79,8 @@ class VideoProcessor:
         target_fps: Optional[float] = None,
         input_duration: Optional[float] = None,
     ) -> Tuple[int, List[str]]:
-        if error_list is None:
-            error_list = []
+        # A corrupt input can log an error per frame; keep only the tail
+        errors: Deque[str] = deque(error_list or (), maxlen=MAX_ERROR_LINES)
 
         start_time = time.perf_counter()
         tot_time = start_time
@@ -67,23 +96,13 @@ class VideoProcessor:
                 fps_ratio = target_fps / self._input_fps
                 output_total_frames = int(total_frames * fps_ratio)
 
-        error_patterns = [
-            r"\[error\]", r"Error", r"error", r"ERROR",
-            r"Failed", r"failed", r"FAILED",
-            r"Impossible", r"impossible",
-            r"Could not", r"could not",
-            r"Cannot", r"cannot",
-            r"Invalid", r"invalid",
-            r"not found", r"Not found", r"NOT FOUND",
-            r"Permission denied", r"permission denied",
-            r"No such file", r"no such file",
-            r"Hardware is lacking", r"hardware is lacking",
-            r"Function not implemented", r"function not implemented",
-            r"moov atom not found", r"Invalid data found",
-        ]
+        # Denominator shown in the progress text; fixed for the whole encode
+        frames_total = output_total_frames or total_frames or 0
 
         progress_data = {}
-        for line in process.stdout:
+        # Read raw bytes: -progress keys are ASCII. Commands run with
+        # -loglevel error, so every other line is an error record.
+        for raw_line in iter(process.stdout.readline, b""):
             if self._cancel_requested:
                 logger.info("Cancel requested, terminating FFmpeg process")
                 process.terminate()
@@ -92,20 +111,14 @@ class VideoProcessor:
                 except subprocess.TimeoutExpired:
                     process.kill()
                 self._log(reporter, "\nOperation cancelled by user\n")
-                return -1, error_list
+                return -1, list(errors)
 
-            for pattern in error_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    error_list.append(line.strip())
-                    break
-
-            line = line.strip()
-            if "=" in line and not line.startswith("ffmpeg") and not line.startswith("Input"):
-                try:
-                    key, value = line.split("=", 1)
-                    progress_data[key] = value
-                except ValueError:
-                    pass
+            line = raw_line.strip()
+            key, sep, value = line.partition(b"=")
+            if sep and b" " not in key:
+                progress_data[key.decode("ascii", "replace")] = value.decode("ascii", "replace")
+            elif line:
+                errors.append(line.decode("utf-8", "replace"))
 
             if "progress" in progress_data:
                 now = time.perf_counter()
@@ -148,18 +161,19 @@ class VideoProcessor:
                 hours, minutes = divmod(remaining_time, 3600)
                 minutes, seconds = divmod(minutes, 60)
                 rem_str = f"{hours:02}:{minutes:02}:{seconds:02}"
+                running_min = (now - tot_time) / 60
 
                 reporter.on_progress({
                     "frames_processed": current_frame,
-                    "total_frames": output_total_frames or total_frames or 0,
+                    "total_frames": frames_total,
                     "percent": percent,
                     "fps": encoding_fps,
-                    "time_running_min": (now - tot_time) / 60,
+                    "time_running_min": running_min,
                     "time_remaining": rem_str,
-                    "Frames Processed:": f"{current_frame}/{output_total_frames or total_frames or 0}",
+                    "Frames Processed:": f"{current_frame}/{frames_total}",
                     "Progress:": f"{percent:.2f}%",
                     "Average Frame Rate:": f"{encoding_fps:.1f} fps",
-                    "Time Running:": f"{(now - tot_time) / 60:.2f} min",
+                    "Time Running:": f"{running_min:.2f} min",
                     "Time Remaining:": rem_str,
                 })
 
@@ -168,7 +182,83 @@ class VideoProcessor:
                 progress_data = {}
 
         return_code = process.wait()
-        return return_code, error_list
+        return return_code, list(errors)
+
+    @staticmethod
+    def parallel_workers(use_gpu: bool, cpu_cores: int) -> int:
+        """Number of files to encode at once.
+
+        Hardware encoders get a small fixed number of sessions; CPU encodes
+        get one worker per four cores.
+        """
+        if use_gpu:
+            return MAX_PARALLEL_HW_ENCODES
+        return max(1, min(MAX_PARALLEL_ENCODES, cpu_cores // 4))
+
+    @staticmethod
+    def can_stream_copy(
+        codec: Optional[str],
+        width: Optional[int],
+        height: Optional[int],
+        xaxis: str,
+        yaxis: str,
+        fps: Optional[float] = None,
+    ) -> bool:
+        """True when the source already matches the target and needs no re-encode."""
+        if fps is not None or codec not in REMUX_CODECS:
+            return False
+        try:
+            return (width, height) == (int(xaxis), int(yaxis))
+        except (TypeError, ValueError):
+            return False
+
+    def remux_video(
+        self,
+        input_file: str,
+        output_file: str,
+        total_frames: Optional[int] = None,
+        reporter: Optional[ProgressReporter] = None,
+        input_duration: Optional[float] = None,
+    ) -> bool:
+        """Copy input_file to output_file without re-encoding."""
+        rep = get_reporter(reporter)
+        self._cancel_requested = False
+        ffmpeg_cmd = FFmpegCommandBuilder.build_remux_command(input_file, output_file)
+
+        try:
+            process = self._start_ffmpeg(ffmpeg_cmd)
+            self._current_process = process
+            self._log(rep, "Source already matches target; copying streams without re-encoding...\n")
+
+            return_code, error_list = self._process_ffmpeg_output(
+                process, rep, total_frames, input_file=input_file, input_duration=input_duration,
+            )
+            self._current_process = None
+
+            if self._cancel_requested or return_code == -1:
+                if os.path.exists(output_file):
+                    try:
+                        os.remove(output_file)
+                        self._log(rep, "\nPartial output file removed.\n")
+                    except Exception as e:
+                        logger.warning(f"Could not remove partial file: {e}")
+                self._log(rep, "\nOperation cancelled by user.\n")
+                return False
+
+            return self._handle_process_result(
+                return_code, error_list, output_file, rep, input_file
+            )
+
+        except FileNotFoundError:
+            self._current_process = None
+            self._log(rep, "FFmpeg not found! Make sure it's installed and added to PATH.\n")
+            logger.error("FFmpeg not found")
+            return False
+        except Exception as e:
+            self._current_process = None
+            logger.error(f"Error during remux: {e}")
+            self._log(rep, f"\nError: {e}\n")
+            return False
 
     def scale_video_cpu(
         self,
@@ -185,6 +275,7 @@ class VideoProcessor:
         fps: Optional[float] = None,
         input_duration: Optional[float] = None,
         input_fps: Optional[float] = None,
+        fast_encode: bool = False,
     ) -> bool:
         rep = get_reporter(reporter)
         self._cancel_requested = False
@@ -211,26 +302,13 @@ class VideoProcessor:
             logger.warning(f"Could not log resolution: {e}")
 
         ffmpeg_cmd = FFmpegCommandBuilder.build_scale_command_cpu(
-            input_file, output_file, xaxis, yaxis, crf, preset, threads, fps=fps
+            input_file, output_file, xaxis, yaxis, crf, preset, threads, fps=fps,
+            fast_encode=fast_encode, use_zscale="zscale" in available_filters(),
         )
         error_list: List[str] = []
 
         try:
-            startupinfo = None
-            if os.name == "nt":
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-
-            process = subprocess.Popen(
-                ffmpeg_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-                startupinfo=startupinfo,
-                env=subprocess_env(),
-            )
+            process = self._start_ffmpeg(ffmpeg_cmd)
             self._current_process = process
 
             threading_info = f" with {threads} threads" if threads > 0 else " (auto threading)"
@@ -281,9 +359,12 @@ class VideoProcessor:
         fps: Optional[float] = None,
         input_duration: Optional[float] = None,
         input_fps: Optional[float] = None,
+        fast_encode: bool = False,
+        video_codec: Optional[str] = None,
     ) -> bool:
         rep = get_reporter(reporter)
         self._cancel_requested = False
+        video_codec = video_codec or detect_hw_encoder() or GPU_CODEC
 
         if input_duration is None or input_fps is None:
             from .VideoInfo import VideoInfo
@@ -306,29 +387,18 @@ class VideoProcessor:
         except Exception as e:
             logger.warning(f"Could not log resolution: {e}")
 
+        filters = available_filters()
         ffmpeg_cmd = FFmpegCommandBuilder.build_scale_command_gpu(
-            input_file, output_file, xaxis, yaxis, crf, preset, fps=fps
+            input_file, output_file, xaxis, yaxis, crf, preset, video_codec=video_codec, fps=fps,
+            fast_encode=fast_encode,
+            use_npp="scale_cuda" not in filters and "scale_npp" in filters,
         )
         error_list: List[str] = []
 
         try:
-            startupinfo = None
-            if os.name == "nt":
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-
-            process = subprocess.Popen(
-                ffmpeg_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-                startupinfo=startupinfo,
-                env=subprocess_env(),
-            )
+            process = self._start_ffmpeg(ffmpeg_cmd)
             self._current_process = process
-            self._log(rep, "Starting FFmpeg with GPU acceleration (NVENC)...\n")
+            self._log(rep, f"Starting FFmpeg with GPU acceleration ({video_codec})...\n")
 
             return_code, error_list = self._process_ffmpeg_output(
                 process, rep, total_frames, error_list, input_file,
@@ -346,14 +416,12 @@ class VideoProcessor:
                 self._log(rep, "\nOperation cancelled by user.\n")
                 return False
 
-            nvenc_dll_error = any(
-                "Cannot load nvEncodeAPI64.dll" in err or "nvEncodeAPI" in err
-                for err in error_list
-            )
-
-            if nvenc_dll_error:
-                logger.warning("NVENC DLL error detected, falling back to CPU encoding")
-                self._log(rep, "\nGPU encoding failed, falling back to CPU...\n")
+            # NVENC, QSV, AMF, VAAPI and VideoToolbox all fail differently; a
+            # genuinely bad input just fails again on CPU and is reported there
+            if return_code != 0:
+                reason = error_list[-1] if error_list else self._get_ffmpeg_error_code(return_code)
+                logger.warning(f"{video_codec} failed ({reason}), falling back to CPU encoding")
+                self._log(rep, f"\nGPU encoding failed ({reason}), falling back to CPU...\n")
                 if os.path.exists(output_file):
                     try:
                         os.remove(output_file)
@@ -363,6 +431,7 @@ class VideoProcessor:
                     input_file, output_file, total_frames, rep,
                     ratio, xaxis, yaxis, crf, preset, threads=0, fps=fps,
                     input_duration=input_duration, input_fps=input_fps,
+                    fast_encode=fast_encode,
                 )
 
             return self._handle_process_result(
@@ -421,32 +490,42 @@ class VideoProcessor:
                     logger.warning(f"Could not get file sizes: {e}")
 
             if error_list:
-                self._log(reporter, f"\nWarnings detected: {len(error_list)} warning(s)\n")
-                for error in error_list[:5]:
-                    self._log(reporter, f"  - {error}\n")
+                # One log event for the whole summary rather than one per line
+                summary = [f"\nFFmpeg reported {len(error_list)} non-fatal error(s)\n"]
+                summary += [f"  - {error}\n" for error in error_list[:5]]
                 if len(error_list) > 5:
-                    self._log(reporter, f"  ... and {len(error_list) - 5} more\n")
+                    summary.append(f"  ... and {len(error_list) - 5} more\n")
+                self._log(reporter, "".join(summary))
             return True
 
         error_msg = self._get_ffmpeg_error_code(return_code)
         self._log(reporter, f"\nFFmpeg failed with return code {return_code}: {error_msg}\n")
         if error_list:
-            is_moov_error = any("moov atom not found" in err for err in error_list)
-            is_invalid_data = any("Invalid data found" in err for err in error_list)
-            if is_moov_error:
-                self._log(reporter, "  ! HINT: Input file may be corrupted (moov atom not found).\n")
-            if is_invalid_data:
-                self._log(reporter, "  ! HINT: Input file contains invalid data.\n")
-            for error in error_list:
-                self._log(reporter, f"  - {error}\n")
+            summary = []
+            if any("moov atom not found" in err for err in error_list):
+                summary.append("  ! HINT: Input file may be corrupted (moov atom not found).\n")
+            if any("Invalid data found" in err for err in error_list):
+                summary.append("  ! HINT: Input file contains invalid data.\n")
+            summary += [f"  - {error}\n" for error in error_list]
+            self._log(reporter, "".join(summary))
         return False
 
     @staticmethod
     def _get_ffmpeg_error_code(return_code: int) -> str:
-        error_codes = {
-            0: "Success", 1: "Unknown error", -1: "Process terminated",
-            -2: "Invalid argument", -3: "No such file or directory",
-            -4: "Permission denied", -5: "I/O error", -6: "No space left on device",
-            -7: "Out of memory", -8: "Invalid data found",
-        }
-        return error_codes.get(return_code, f"Unknown error code: {return_code}")
+        """Describe an FFmpeg exit status.
+
+        FFmpeg exits with 1 for any failure (the cause is in its log, not the
+        code); negative codes are POSIX signals, huge ones Windows NTSTATUS crashes.
+        """
+        if return_code == 0:
+            return "Success"
+        if return_code == 1:
+            return "FFmpeg error (see messages below)"
+        if return_code < 0:
+            try:
+                return f"Terminated by {signal.Signals(-return_code).name}"
+            except ValueError:
+                return f"Terminated by signal {-return_code}"
+        if return_code > 0xFFFF:
+            return f"Crashed (status 0x{return_code:08X})"
+        return f"Exit code {return_code}"
@@ -46,9 +46,35 @@ CPU_CODEC = "libx264"
 CPU_CODEC_OPTIONS = ["libx264", "libx265", "libvpx-vp9"]  # H.264, H.265/HEVC, VP9
 GPU_CODEC = "h264_nvenc"
 GPU_CODEC_OPTIONS = ["h264_nvenc", "hevc_nvenc"]  # H.264 NVENC, H.265 NVENC
+# x264 preset names NVENC rejects, mapped to its p1 (fastest) .. p7 (slowest) scale
+NVENC_PRESET_MAP = {
+    "ultrafast": "p1", "superfast": "p2", "veryfast": "p3", "faster": "p3",
+    "slower": "p6", "veryslow": "p7",
+}
+
+# Fast encode tuning (libx264 shorter lookahead; no -tune, fastdecode costs size)
+FAST_ENCODE_X264_PARAMS = "rc-lookahead=20"
+X264_MAX_THREADS = 16  # Cap on explicit -threads for libx264
+FASTSTART_EXTENSIONS = (".mp4", ".mov", ".m4v")  # Containers that accept -movflags +faststart
+
+# Sources in these codecs are stream-copied when already at the target size
+REMUX_CODECS = frozenset({"h264"})
 
 # Supported Video Formats
 SUPPORTED_VIDEO_FORMATS = (".mp4", ".mkv", ".avi", ".mov", ".flv", ".wmv")
+SUPPORTED_VIDEO_EXTENSIONS = frozenset(ext.lstrip(".") for ext in SUPPORTED_VIDEO_FORMATS)
+
+# Metadata probing
+PROBE_MAX_WORKERS = 16  # Upper bound on concurrent ffprobe subprocesses
+PROBE_CACHE_SIZE = 512  # In-memory ffprobe results kept per session
+PROBE_CACHE_FILENAME = "probe_cache.json"
+HEADER_PROBE_EXTENSIONS = (".mp4", ".mov", ".m4v")  # Read from the moov box without ffprobe
+
+# Parallel encoding
+MAX_PARALLEL_ENCODES = 4  # Upper bound on concurrent CPU encodes per compress job
+# Concurrent hardware encodes: two streams keep one NVENC/QSV engine busy while the
+# other decodes, well under consumer session limits (sessions exhausted -> CPU fallback)
+MAX_PARALLEL_HW_ENCODES = 2
 
 # UI Colors (default dark theme)
 DEFAULT_WINDOW_BG = '#1e1e1e'
@@ -64,13 +90,21 @@ JOINER_WINDOW_TITLE = "Video Joiner"
 
 # Progress Tracking
 PROGRESS_UPDATE_INTERVAL = 5  # Update progress every N frames
-AVG_FRAME_BUFFER_SIZE = 50
-AVG_TIME_BUFFER_SIZE = 50
+PROGRESS_STATS_PERIOD = "0.5"  # Seconds between FFmpeg -progress blocks
+# Only errors reach the progress pipe; banner, stream info and warnings are never read
+FFMPEG_LOG_ARGS = ["-hide_banner", "-loglevel", "error"]
+UI_PROGRESS_INTERVAL = 0.2  # Minimum seconds between per-frame UI pushes
 
 # File Naming
 OUTPUT_FILENAME_FORMAT = "{base}_{ratio}_{crf}_{preset}_{timestamp}.mp4"
 JOINED_OUTPUT_FILENAME = "joined_output.mp4"
 CONCAT_LIST_FILENAME = "concat_list.txt"
+CONCAT_LIST_STDIN = "pipe:0"  # Concat list streamed to FFmpeg instead of a file
+
+MAX_ERROR_LINES = 50  # FFmpeg error/warning lines kept per encode for the summary
+
+# Process priority
+ENCODER_NICENESS = 10  # POSIX nice value for encodes; Windows uses BELOW_NORMAL_PRIORITY_CLASS
 
 # Timeouts and Delays
 PROCESS_TERMINATION_TIMEOUT = 5  # seconds
@@ -0,0 +1,173 @@
+"""
+Minimal MP4/MOV (ISO BMFF) header reader for video metadata.
+
+Reads the moov box directly so opening a file doesn't need an ffprobe
+subprocess. Anything unexpected returns None and callers fall back to ffprobe.
+"""
+
+import logging
+import struct
+from fractions import Fraction
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Sample entry fourcc -> ffprobe codec_name
+_CODEC_NAMES = {
+    b"avc1": "h264", b"avc3": "h264",
+    b"hvc1": "hevc", b"hev1": "hevc",
+    b"av01": "av1", b"vp09": "vp9", b"mp4v": "mpeg4",
+}
+_MAX_MOOV_SIZE = 64 * 1024 * 1024  # Larger headers aren't worth reading in Python
+
+ProbeResult = Tuple[str, int, int, str, float, int]
+
+
+def _box_header(data: bytes, pos: int, end: int) -> Optional[Tuple[bytes, int, int]]:
+    """Return (type, header_length, box_size) for the box at pos, or None if malformed."""
+    if pos + 8 > end:
+        return None
+    size, box_type = struct.unpack_from(">I4s", data, pos)
+    header_len = 8
+    if size == 1:
+        if pos + 16 > end:
+            return None
+        size = struct.unpack_from(">Q", data, pos + 8)[0]
+        header_len = 16
+    elif size == 0:
+        size = end - pos
+    if size < header_len:
+        return None
+    return box_type, header_len, size
+
+
+def _iter_boxes(data: bytes, start: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+    """Yield (type, payload_start, box_end) for the child boxes in data[start:end]."""
+    pos = start
+    while True:
+        header = _box_header(data, pos, end)
+        if header is None:
+            return
+        box_type, header_len, size = header
+        if pos + size > end:
+            return
+        yield box_type, pos + header_len, pos + size
+        pos += size
+
+
+def _find(data: bytes, span: Optional[Tuple[int, int]], box_type: bytes) -> Optional[Tuple[int, int]]:
+    if span is None:
+        return None
+    for child_type, start, end in _iter_boxes(data, *span):
+        if child_type == box_type:
+            return start, end
+    return None
+
+
+def _read_moov(f: BinaryIO) -> Optional[bytes]:
+    """Seek across top-level boxes and return the moov payload."""
+    pos = 0
+    while True:
+        f.seek(pos)
+        raw = f.read(16)
+        header = _box_header(raw, 0, len(raw))
+        if header is None:
+            return None
+        box_type, header_len, size = header
+        runs_to_eof = struct.unpack_from(">I", raw)[0] == 0
+        if box_type == b"moov":
+            f.seek(pos + header_len)
+            if runs_to_eof:
+                payload = f.read(_MAX_MOOV_SIZE + 1)
+                return payload if len(payload) <= _MAX_MOOV_SIZE else None
+            payload_len = size - header_len
+            if payload_len > _MAX_MOOV_SIZE:
+                return None
+            payload = f.read(payload_len)
+            return payload if len(payload) == payload_len else None
+        if runs_to_eof:
+            return None
+        pos += size
+
+
+def _timescale_and_duration(data: bytes, start: int) -> Tuple[int, int]:
+    """Read timescale/duration from an mvhd or mdhd payload."""
+    if data[start] == 1:
+        return struct.unpack_from(">IQ", data, start + 20)
+    return struct.unpack_from(">II", data, start + 12)
+
+
+def _parse_video_track(data: bytes, trak: Tuple[int, int]) -> Optional[Tuple[str, int, int, int, int, int, set]]:
+    mdia = _find(data, trak, b"mdia")
+    hdlr = _find(data, mdia, b"hdlr")
+    if hdlr is None or data[hdlr[0] + 8:hdlr[0] + 12] != b"vide":
+        return None
+    mdhd = _find(data, mdia, b"mdhd")
+    stbl = _find(data, _find(data, mdia, b"minf"), b"stbl")
+    stsd = _find(data, stbl, b"stsd")
+    stts = _find(data, stbl, b"stts")
+    if mdhd is None or stsd is None or stts is None:
+        return None
+
+    timescale, duration = _timescale_and_duration(data, mdhd[0])
+
+    # stsd: version/flags, entry count, then visual sample entries
+    fourcc = data[stsd[0] + 12:stsd[0] + 16]
+    codec = _CODEC_NAMES.get(fourcc)
+    if codec is None:
+        return None
+    width, height = struct.unpack_from(">HH", data, stsd[0] + 8 + 32)
+
+    entry_count = struct.unpack_from(">I", data, stts[0] + 4)[0]
+    frames = 0
+    deltas = set()
+    for i in range(entry_count):
+        sample_count, delta = struct.unpack_from(">II", data, stts[0] + 8 + i * 8)
+        frames += sample_count
+        deltas.add(delta)
+    return codec, width, height, timescale, duration, frames, deltas
+
+
+def probe_mp4(video_path: str) -> Optional[ProbeResult]:
+    """Read (codec, width, height, r_frame_rate, duration, total_frames) from an MP4/MOV header.
+
+    Args:
+        video_path: Path to the video file
+
+    Returns:
+        Same shape as VideoInfo._extract_probe, or None if the file can't be
+        read this way (fragmented MP4, unknown codec, truncated header, ...)
+    """
+    try:
+        with open(video_path, "rb") as f:
+            moov = _read_moov(f)
+        if moov is None:
+            return None
+
+        span = (0, len(moov))
+        movie_duration = None
+        mvhd = _find(moov, span, b"mvhd")
+        if mvhd is not None:
+            movie_timescale, movie_length = _timescale_and_duration(moov, mvhd[0])
+            if movie_timescale:
+                movie_duration = movie_length / movie_timescale
+
+        for box_type, start, end in _iter_boxes(moov, *span):
+            if box_type != b"trak":
+                continue
+            track = _parse_video_track(moov, (start, end))
+            if track is None:
+                continue
+            codec, width, height, timescale, track_length, frames, deltas = track
+            if not frames or not timescale or not track_length or not width or not height:
+                return None
+            if len(deltas) == 1:
+                rate = Fraction(timescale, deltas.pop())
+            else:
+                rate = Fraction(frames * timescale, track_length).limit_denominator(1001)
+            duration = movie_duration or track_length / timescale
+            return codec, width, height, f"{rate.numerator}/{rate.denominator}", duration, frames
+        return None
+    except (OSError, struct.error, IndexError, ZeroDivisionError) as e:
+        logger.debug(f"Header probe failed for {video_path}: {e}")
+        return None
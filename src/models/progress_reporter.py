@@ -28,7 +28,8 @@ class NullProgressReporter:
 class PrintProgressReporter:
     """CLI-friendly reporter that prints logs and periodic progress."""
 
-    def __init__(self):
+    def __init__(self, prefix: str = ""):
+        self._prefix = prefix
         self._last_percent = -1
 
     def on_progress(self, metrics: dict) -> None:
@@ -37,7 +38,7 @@ class PrintProgressReporter:
             self._last_percent = int(percent)
             fps = metrics.get("fps", 0)
             remaining = metrics.get("time_remaining", "")
-            print(f"Progress: {percent:.2f}% | FPS: {fps:.1f} | Rem: {remaining}")
+            print(f"{self._prefix}Progress: {percent:.2f}% | FPS: {fps:.1f} | Rem: {remaining}")
 
     def on_log(self, line: str) -> None:
         print(line, end="" if line.endswith("\n") else "\n")
@@ -69,6 +69,21 @@ def materialize_splash_url() -> str:
     return cache_path.resolve().as_uri()
 
 
+def available_cores() -> int:
+    """CPU cores this process may run on.
+
+    Honours affinity masks and container CPU sets, which os.cpu_count() ignores.
+    """
+    if hasattr(os, "process_cpu_count"):  # Python 3.13+
+        return os.process_cpu_count() or 1
+    if hasattr(os, "sched_getaffinity"):
+        try:
+            return len(os.sched_getaffinity(0)) or 1
+        except OSError:
+            pass
+    return os.cpu_count() or 1
+
+
 def get_log_path() -> str:
     if is_frozen():
         return get_data_path("ffmpegMagic_log.log")
@@ -2,10 +2,11 @@
 Resolve bundled or system FFmpeg / ffprobe executables.
 """
 
+import functools
 import os
-import sys
+import shutil
 from pathlib import Path
-from typing import Optional
+from typing import Dict, FrozenSet, List, Optional
 
 FFMPEG_PROJECT_URL = "https://ffmpeg.org"
 FFMPEG_LEGAL_URL = "https://www.ffmpeg.org/legal.html"
@@ -13,6 +14,15 @@ FFMPEG_SOURCE_URL = "https://github.com/BtbN/FFmpeg-Builds"
 
 _NOTICE_FILE = "NOTICE.txt"
 
+_version_line: Optional[str] = None
+_bundled_paths: Dict[str, str] = {}
+_exe_paths: Dict[str, str] = {}
+
+VAAPI_RENDER_NODE = "/dev/dri/renderD128"  # First DRM render node (Linux AMD/Intel)
+
+# Hardware H.264 encoders in order of preference
+HW_H264_ENCODERS = ("h264_nvenc", "h264_qsv", "h264_amf", "h264_vaapi", "h264_videotoolbox")
+
 
 def _repo_root() -> Path:
     return Path(__file__).resolve().parent.parent.parent
@@ -26,30 +36,55 @@ def _vendor_win64_dir() -> Path:
         return _repo_root() / "vendor" / "ffmpeg" / "win64"
 
 
+def _bundled_exe(name: str) -> Optional[str]:
+    """Absolute path of a bundled executable, resolved once per process.
+
+    Misses aren't cached, matching ffmpeg_version_line(): a build dropped into
+    vendor/ is picked up without restarting.
+    """
+    cached = _bundled_paths.get(name)
+    if cached is not None:
+        return cached
+    exe = _vendor_win64_dir() / f"{name}.exe"
+    if not exe.is_file():
+        return None
+    _bundled_paths[name] = str(exe.resolve())
+    return _bundled_paths[name]
+
+
+def _resolve_exe(name: str) -> str:
+    """Absolute path of the bundled build or the one on PATH, resolved once per process.
+
+    An absolute argv[0] also lets subprocess launch with posix_spawn. If
+    neither is found the bare name is returned uncached, so a later install
+    is still picked up.
+    """
+    cached = _exe_paths.get(name)
+    if cached is not None:
+        return cached
+    exe = _bundled_exe(name) or shutil.which(name)
+    if not exe:
+        return name
+    _exe_paths[name] = os.path.abspath(exe)
+    return _exe_paths[name]
+
+
 def get_ffmpeg_exe() -> str:
-    bundled = _vendor_win64_dir() / "ffmpeg.exe"
-    if bundled.is_file():
-        return str(bundled.resolve())
-    return "ffmpeg"
+    return _resolve_exe("ffmpeg")
 
 
 def get_ffprobe_exe() -> str:
-    bundled = _vendor_win64_dir() / "ffprobe.exe"
-    if bundled.is_file():
-        return str(bundled.resolve())
-    return "ffprobe"
+    return _resolve_exe("ffprobe")
 
 
 def is_bundled() -> bool:
-    return (_vendor_win64_dir() / "ffmpeg.exe").is_file()
+    return _bundled_exe("ffmpeg") is not None
 
 
 def ffmpeg_bin_dir() -> Optional[str]:
     """Directory containing bundled ffmpeg (for PATH augmentation if needed)."""
-    d = _vendor_win64_dir()
-    if (d / "ffmpeg.exe").is_file():
-        return str(d.resolve())
-    return None
+    exe = _bundled_exe("ffmpeg")
+    return os.path.dirname(exe) if exe else None
 
 
 def subprocess_env() -> Optional[dict]:
@@ -62,19 +97,123 @@ def subprocess_env() -> Optional[dict]:
     return env
 
 
-def check_ffmpeg_available() -> bool:
+def can_posix_spawn(cmd: List[str]) -> bool:
+    """True when Popen can launch cmd with posix_spawn instead of forking the app.
+
+    CPython only takes that path for an absolute executable with
+    close_fds=False; anything else keeps the default fd closing.
+    """
+    return os.name != "nt" and os.path.isabs(cmd[0])
+
+
+def ffmpeg_version_line() -> Optional[str]:
+    """First line of `ffmpeg -version`, or None if FFmpeg can't be run.
+
+    A successful answer is kept for the process; failures are retried so a
+    freshly installed FFmpeg is picked up without restarting.
+    """
+    global _version_line
+    if _version_line is not None:
+        return _version_line
     import subprocess
     try:
-        subprocess.run(
+        result = subprocess.run(
             [get_ffmpeg_exe(), "-version"],
             capture_output=True,
             check=True,
+            text=True,
             timeout=15,
             env=subprocess_env(),
         )
-        return True
     except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+    _version_line = result.stdout.splitlines()[0] if result.stdout else ""
+    return _version_line
+
+
+def check_ffmpeg_available() -> bool:
+    return ffmpeg_version_line() is not None
+
+
+@functools.lru_cache(maxsize=1)
+def detect_hw_encoder() -> Optional[str]:
+    """First hardware H.264 encoder this FFmpeg build offers and this machine can run, or None.
+
+    Builds list every encoder they were compiled with (BtbN Windows builds
+    always include NVENC), so each listed candidate is tried with a one-frame
+    test encode in preference order. Runs once per process; the answer can't
+    change while the app is running.
+    """
+    import subprocess
+    startupinfo = None
+    if os.name == "nt":
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    try:
+        result = subprocess.run(
+            [get_ffmpeg_exe(), "-hide_banner", "-encoders"],
+            capture_output=True,
+            text=True,
+            timeout=15,
+            startupinfo=startupinfo,
+            env=subprocess_env(),
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    available = {line.split()[1] for line in result.stdout.splitlines() if len(line.split()) > 1}
+    if not os.path.exists(VAAPI_RENDER_NODE):
+        # Linux builds list VAAPI even on machines without a render device
+        available.discard("h264_vaapi")
+    return next((enc for enc in HW_H264_ENCODERS if enc in available and _encoder_works(enc)), None)
+
+
+def _encoder_works(encoder: str) -> bool:
+    """Encode one synthetic frame with encoder; False if the device or driver is missing."""
+    import subprocess
+    startupinfo = None
+    if os.name == "nt":
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    if "vaapi" in encoder:
+        upload = ["-vaapi_device", VAAPI_RENDER_NODE]
+        vf = ["-vf", "format=nv12,hwupload"]
+    else:
+        upload, vf = [], []
+    try:
+        result = subprocess.run(
+            [get_ffmpeg_exe(), "-hide_banner", "-loglevel", "error", *upload,
+             "-f", "lavfi", "-i", "nullsrc=s=256x256", "-frames:v", "1", *vf,
+             "-c:v", encoder, "-f", "null", "-"],
+            capture_output=True,
+            timeout=15,
+            startupinfo=startupinfo,
+            env=subprocess_env(),
+        )
+    except (OSError, subprocess.SubprocessError):
         return False
+    return result.returncode == 0
+
+
+@functools.lru_cache(maxsize=1)
+def available_filters() -> FrozenSet[str]:
+    """Names of the filters this FFmpeg build offers (cached for the process)."""
+    import subprocess
+    startupinfo = None
+    if os.name == "nt":
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    try:
+        result = subprocess.run(
+            [get_ffmpeg_exe(), "-hide_banner", "-filters"],
+            capture_output=True,
+            text=True,
+            timeout=15,
+            startupinfo=startupinfo,
+            env=subprocess_env(),
+        )
+    except (OSError, subprocess.SubprocessError):
+        return frozenset()
+    return frozenset(line.split()[1] for line in result.stdout.splitlines() if len(line.split()) > 2)
 
 
 def read_notice_text() -> str:
@@ -94,20 +233,7 @@ def read_notice_text() -> str:
 def get_ffmpeg_info() -> dict:
     exe = get_ffmpeg_exe()
     bundled = is_bundled()
-    version_line = ""
-    if check_ffmpeg_available():
-        import subprocess
-        try:
-            r = subprocess.run(
-                [exe, "-version"],
-                capture_output=True,
-                text=True,
-                timeout=15,
-                env=subprocess_env(),
-            )
-            version_line = (r.stdout or "").splitlines()[0] if r.stdout else ""
-        except Exception:
-            pass
+    version_line = ffmpeg_version_line() or ""
     source_meta = _vendor_win64_dir() / "SOURCE.txt"
     source_url = source_meta.read_text(encoding="utf-8").strip() if source_meta.is_file() else FFMPEG_SOURCE_URL
     return {
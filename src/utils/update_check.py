@@ -6,7 +6,6 @@ import json
 import logging
 import re
 import urllib.error
-import urllib.request
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 
@@ -53,6 +52,8 @@ def _get_update_config(user_config: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def fetch_manifest(url: str = DEFAULT_MANIFEST_URL, timeout: int = 15) -> Dict[str, Any]:
+    # Imported here: urllib.request pulls in http.client/ssl, which app start-up doesn't need
+    import urllib.request
     req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
     with urllib.request.urlopen(req, timeout=timeout) as resp:
         return json.loads(resp.read().decode("utf-8"))
@@ -98,6 +98,7 @@ async function loadSettingsView() {
         `  Use GPU: ${s.performance.use_gpu}`,
         `  Use All CPU Cores: ${s.performance.use_all_cores}`,
         `  Cap CPU 50%: ${s.performance.cap_cpu_50}`,
+        `  Fast Encode Tuning: ${s.performance.fast_encode}`,
         '',
         'Encoding Defaults:',
         `  Default CRF: ${s.encoding.crf}`,
@@ -9,7 +9,7 @@ const CompressUI = (function () {
   const BUSY_IDS = [
     'compress-add-files', 'compress-add-folder', 'compress-remove',
     'compress-browse-output', 'compress-reset', 'compress-gpu',
-    'compress-all-cores', 'compress-cap-50', 'compress-fps',
+    'compress-all-cores', 'compress-cap-50', 'compress-fast-encode', 'compress-fps',
     'compress-resolution', 'compress-crf', 'compress-preset',
   ];
 
@@ -18,6 +18,7 @@ const CompressUI = (function () {
     'Frames Processed:', 'Progress:', 'Average Frame Rate:',
     'Time Running:', 'Time Remaining:',
   ];
+  const metricSpans = new Map();  // metric key -> value <span>, filled by initMetrics
 
   function setBusy(busy) {
     BUSY_IDS.forEach(id => {
@@ -40,35 +41,42 @@ const CompressUI = (function () {
 
   function fillSelect(id, options, value) {
     const sel = document.getElementById(id);
-    sel.innerHTML = '';
-    options.forEach(o => {
-      const opt = document.createElement('option');
-      opt.value = o;
-      opt.textContent = o;
-      sel.appendChild(opt);
-    });
+    // Options are fixed per session; rebuild only when the list actually changes
+    const key = options.join('\u0000');
+    if (sel.dataset.options !== key) {
+      const frag = document.createDocumentFragment();
+      options.forEach(o => {
+        const opt = document.createElement('option');
+        opt.value = o;
+        opt.textContent = o;
+        frag.appendChild(opt);
+      });
+      sel.replaceChildren(frag);
+      sel.dataset.options = key;
+    }
     if (value) sel.value = value;
   }
 
   function initMetrics() {
     const grid = document.getElementById('compress-metrics');
     grid.innerHTML = '';
+    metricSpans.clear();
     METRIC_KEYS.forEach(key => {
       const div = document.createElement('div');
       div.className = 'progress-metric';
       div.id = 'metric-' + key.replace(/[^a-z]/gi, '');
       div.innerHTML = `<strong>${key}</strong> <span>-</span>`;
       grid.appendChild(div);
+      metricSpans.set(key, div.querySelector('span'));
     });
   }
 
   function updateMetric(key, value) {
-    const id = 'metric-' + key.replace(/[^a-z]/gi, '');
-    const el = document.getElementById(id);
-    if (el) {
-      const span = el.querySelector('span');
-      if (span) span.textContent = value;
-    }
+    const span = metricSpans.get(key);
+    const text = String(value);
+    // Skip DOM writes (and the repaint) when the value hasn't changed
+    if (!span || span.textContent === text) return;
+    span.textContent = text;
     if (key === 'Progress:') {
       const pct = parseFloat(String(value).replace('%', '')) || 0;
       document.getElementById('compress-progress-bar').style.width = pct + '%';
@@ -115,10 +123,20 @@ const CompressUI = (function () {
     return d.innerHTML;
   }
 
+  const MAX_LOG_ENTRIES = 2000;  // older entries are dropped so long sessions stay fast
+  let scrollPending = false;
+
   function appendLog(line) {
     const log = document.getElementById('compress-log');
-    log.textContent += line;
-    log.scrollTop = log.scrollHeight;
+    log.append(line);
+    if (log.childNodes.length > MAX_LOG_ENTRIES) log.firstChild.remove();
+    // Reading scrollHeight forces a layout; do it once per frame, not per line
+    if (scrollPending) return;
+    scrollPending = true;
+    requestAnimationFrame(() => {
+      scrollPending = false;
+      log.scrollTop = log.scrollHeight;
+    });
   }
 
   function getSettings() {
@@ -126,6 +144,8 @@ const CompressUI = (function () {
       use_gpu: document.getElementById('compress-gpu').checked,
       use_all_cores: document.getElementById('compress-all-cores').checked,
       cap_cpu_50: document.getElementById('compress-cap-50').checked,
+      fast_encode: document.getElementById('compress-fast-encode').checked,
+      copy_matching: document.getElementById('compress-copy-matching').checked,
       fps: document.getElementById('compress-fps').value,
       resolution: document.getElementById('compress-resolution').value,
       crf: document.getElementById('compress-crf').value,
@@ -139,6 +159,7 @@ const CompressUI = (function () {
     gpu.checked = !!defaults.use_gpu && gpuAvailable;
     document.getElementById('compress-all-cores').checked = !!defaults.use_all_cores;
     document.getElementById('compress-cap-50').checked = !!defaults.cap_cpu_50;
+    document.getElementById('compress-fast-encode').checked = defaults.fast_encode !== false;
   }
 
   async function loadOptions() {
@@ -177,7 +198,7 @@ const CompressUI = (function () {
     });
 
     document.getElementById('compress-add-files').addEventListener('click', async () => {
-      const opts = await window.pywebview.api.compress_get_options();
+      const opts = await window.pywebview.api.compress_get_last_input_folder();
       const dir = (opts && opts.last_input_folder) || '';
       const r = await window.pywebview.api.pick_files(dir, '*.mp4;*.mkv;*.avi;*.mov;*.flv;*.wmv');
       if (!r || r.status !== 'success') {
@@ -188,7 +209,7 @@ const CompressUI = (function () {
     });
 
     document.getElementById('compress-add-folder').addEventListener('click', async () => {
-      const opts = await window.pywebview.api.compress_get_options();
+      const opts = await window.pywebview.api.compress_get_last_input_folder();
       const r = await window.pywebview.api.pick_folder((opts && opts.last_input_folder) || '', 'Select folder', 'input');
       if (!r || r.status !== 'success') {
         showAlert((r && r.message) || 'Could not open folder picker', 'error');
@@ -254,10 +275,10 @@ const CompressUI = (function () {
   }
 
   window.compress_progress = function (data) {
-    Object.keys(data).forEach(k => {
-      if (METRIC_KEYS.includes(k)) updateMetric(k, data[k]);
-    });
-    if (data.percent !== undefined) updateMetric('Progress:', data.percent.toFixed(2) + '%');
+    Object.keys(data).forEach(k => updateMetric(k, data[k]));
+    if (data.percent !== undefined && data['Progress:'] === undefined) {
+      updateMetric('Progress:', data.percent.toFixed(2) + '%');
+    }
   };
 
   window.compress_log = function (data) {
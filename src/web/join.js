@@ -11,10 +11,26 @@ const JoinUI = (function () {
     document.getElementById('join-pick-output').disabled = busy;
   }
 
+  const MAX_LOG_ENTRIES = 2000;  // older entries are dropped so long sessions stay fast
+  let scrollPending = false;
+
   function appendLog(line) {
     const log = document.getElementById('join-log');
-    log.textContent += line;
-    log.scrollTop = log.scrollHeight;
+    log.append(line);
+    if (log.childNodes.length > MAX_LOG_ENTRIES) log.firstChild.remove();
+    // Reading scrollHeight forces a layout; do it once per frame, not per line
+    if (scrollPending) return;
+    scrollPending = true;
+    requestAnimationFrame(() => {
+      scrollPending = false;
+      log.scrollTop = log.scrollHeight;
+    });
+  }
+
+  function setProgress(pct, message) {
+    document.getElementById('join-progress-line').textContent = message;
+    document.getElementById('join-progress-bar').style.width = pct + '%';
+    document.getElementById('join-progress-bar-wrap').setAttribute('aria-valuenow', String(Math.round(pct)));
   }
 
   async function loadLastFolders() {
@@ -69,6 +85,7 @@ const JoinUI = (function () {
       const output = document.getElementById('join-output').value;
       if (!input) { showAlert('Select input folder.', 'error'); return; }
       document.getElementById('join-log').textContent = '';
+      setProgress(0, '');
       setBusy(true);
       const r = await window.pywebview.api.join_start(input, output);
       if (!r || r.status !== 'success') {
@@ -89,7 +106,13 @@ const JoinUI = (function () {
   };
 
   window.join_progress = function (data) {
-    if (data.message) appendLog(data.message + '\n');
+    if (data.percent !== undefined) {
+      setProgress(data.percent, data.message || '');
+    } else if (data.message) {
+      // Total length unknown: text only, bar left indeterminate
+      document.getElementById('join-progress-line').textContent = data.message;
+      document.getElementById('join-progress-bar-wrap').removeAttribute('aria-valuenow');
+    }
   };
 
   window.join_complete = function (data) {
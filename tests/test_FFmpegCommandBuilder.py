@@ -27,7 +27,7 @@ class TestFFmpegCommandBuilder(unittest.TestCase):
             "input.mp4", "output.mp4"
         )
         
-        self.assertIn("ffmpeg", cmd)
+        self.assertEqual(Path(cmd[0]).stem, "ffmpeg")
         self.assertIn("-i", cmd)
         self.assertIn("input.mp4", cmd)
         self.assertIn("output.mp4", cmd)
@@ -47,6 +47,16 @@ class TestFFmpegCommandBuilder(unittest.TestCase):
         self.assertIn("-threads", cmd)
         self.assertIn("4", cmd)
         self.assertEqual(cmd[cmd.index("-threads") + 1], "4")
+        
+        many = FFmpegCommandBuilder.build_scale_command_cpu("input.mp4", "output.mp4", threads=64)
+        self.assertEqual(many[many.index("-threads") + 1], "16")
+        x265 = FFmpegCommandBuilder.build_scale_command_cpu(
+            "input.mp4", "output.mp4", threads=64, video_codec="libx265"
+        )
+        self.assertEqual(x265[x265.index("-threads") + 1], "64")
+        
+        auto = FFmpegCommandBuilder.build_scale_command_cpu("input.mp4", "output.mp4")
+        self.assertNotIn("-threads", auto)
     
     def test_build_scale_command_cpu_custom_resolution(self):
         """Test CPU scale command with custom resolution."""
@@ -65,7 +75,7 @@ class TestFFmpegCommandBuilder(unittest.TestCase):
             "input.mp4", "output.mp4"
         )
         
-        self.assertIn("ffmpeg", cmd)
+        self.assertEqual(Path(cmd[0]).stem, "ffmpeg")
         self.assertIn("-hwaccel", cmd)
         self.assertIn("cuda", cmd)
         self.assertIn("-c:v", cmd)
@@ -94,7 +104,7 @@ class TestFFmpegCommandBuilder(unittest.TestCase):
             "concat_list.txt", "output.mp4"
         )
         
-        self.assertIn("ffmpeg", cmd)
+        self.assertEqual(Path(cmd[0]).stem, "ffmpeg")
         self.assertIn("-f", cmd)
         self.assertIn("concat", cmd)
         self.assertIn("-safe", cmd)
@@ -130,6 +140,98 @@ class TestFFmpegCommandBuilder(unittest.TestCase):
         self.assertIn("-progress", cmd_gpu)
         self.assertIn("pipe:1", cmd_gpu)
 
+    def test_commands_throttle_progress_period(self):
+        """Test that commands ask FFmpeg for periodic progress blocks."""
+        for cmd in (
+            FFmpegCommandBuilder.build_scale_command_cpu("input.mp4", "output.mp4"),
+            FFmpegCommandBuilder.build_scale_command_gpu("input.mp4", "output.mp4"),
+            FFmpegCommandBuilder.build_concat_command("concat_list.txt", "output.mp4"),
+        ):
+            self.assertIn("-stats_period", cmd)
+
+    def test_build_scale_command_fast_encode(self):
+        """Test fast encode adds x264 tuning and faststart only for MP4-style outputs."""
+        cmd = FFmpegCommandBuilder.build_scale_command_cpu("input.mp4", "output.mp4", fast_encode=True)
+        self.assertEqual(cmd[cmd.index("-x264-params") + 1], "rc-lookahead=20")
+        # fastdecode disables CABAC and deblocking, which inflates output at the same CRF
+        self.assertNotIn("-tune", cmd)
+        self.assertEqual(cmd[cmd.index("-movflags") + 1], "+faststart")
+        
+        mkv_cmd = FFmpegCommandBuilder.build_scale_command_cpu("input.mkv", "output.mkv", fast_encode=True)
+        self.assertNotIn("-movflags", mkv_cmd)
+        
+        gpu_cmd = FFmpegCommandBuilder.build_scale_command_gpu("input.mp4", "output.mp4", fast_encode=True)
+        self.assertIn("-movflags", gpu_cmd)
+        self.assertNotIn("-tune", gpu_cmd)
+        
+        plain_cmd = FFmpegCommandBuilder.build_scale_command_cpu("input.mp4", "output.mp4")
+        self.assertNotIn("-tune", plain_cmd)
+        self.assertNotIn("-movflags", plain_cmd)
+
+    def test_build_scale_command_cpu_zscale(self):
+        """Test zscale replaces the swscale filter when requested."""
+        cmd = FFmpegCommandBuilder.build_scale_command_cpu(
+            "input.mp4", "output.mp4", xaxis="1280", yaxis="720", fps=30.0, use_zscale=True
+        )
+        self.assertEqual(cmd[cmd.index("-vf") + 1], "zscale=w=1280:h=720:f=lanczos,fps=30.0")
+
+    def test_build_remux_command(self):
+        """Test remux command copies streams without a video filter."""
+        cmd = FFmpegCommandBuilder.build_remux_command("input.mp4", "output.mp4")
+        self.assertEqual(cmd[cmd.index("-c") + 1], "copy")
+        self.assertNotIn("-vf", cmd)
+        self.assertIn("+faststart", cmd)
+        self.assertEqual(cmd[-1], "output.mp4")
+
+    def test_build_scale_command_gpu_encoder_flags(self):
+        """Test each hardware encoder gets its own quality flags and x264 presets are translated."""
+        nvenc = FFmpegCommandBuilder.build_scale_command_gpu("input.mp4", "output.mp4", preset="ultrafast")
+        self.assertEqual(nvenc[nvenc.index("-preset") + 1], "p1")
+        self.assertEqual(nvenc[nvenc.index("-rc") + 1], "vbr")
+        self.assertEqual(nvenc[nvenc.index("-b:v") + 1], "0")
+        
+        qsv = FFmpegCommandBuilder.build_scale_command_gpu(
+            "input.mp4", "output.mp4", crf="28", preset="ultrafast", video_codec="h264_qsv"
+        )
+        self.assertNotIn("-hwaccel", qsv)
+        self.assertEqual(qsv[qsv.index("-global_quality") + 1], "28")
+        self.assertEqual(qsv[qsv.index("-preset") + 1], "veryfast")
+        
+        vt = FFmpegCommandBuilder.build_scale_command_gpu(
+            "input.mp4", "output.mp4", crf="30", video_codec="h264_videotoolbox"
+        )
+        self.assertEqual(vt[vt.index("-q:v") + 1], "40")
+
+    def test_commands_limit_log_output(self):
+        """Test every command hides the banner and only logs warnings and errors."""
+        cmds = [
+            FFmpegCommandBuilder.build_scale_command_cpu("input.mp4", "output.mp4"),
+            FFmpegCommandBuilder.build_scale_command_gpu("input.mp4", "output.mp4"),
+            FFmpegCommandBuilder.build_remux_command("input.mp4", "output.mp4"),
+            FFmpegCommandBuilder.build_concat_command("list.txt", "output.mp4"),
+        ]
+        for cmd in cmds:
+            self.assertIn("-hide_banner", cmd)
+            self.assertEqual(cmd[cmd.index("-loglevel") + 1], "error")
+            self.assertLess(cmd.index("-loglevel"), cmd.index("-i"))
+
+    def test_build_scale_command_gpu_npp(self):
+        """Test NVENC can scale with scale_npp on builds without scale_cuda."""
+        cmd = FFmpegCommandBuilder.build_scale_command_gpu("input.mp4", "output.mp4", use_npp=True)
+        self.assertEqual(cmd[cmd.index("-vf") + 1], "scale_npp=1280:720")
+        self.assertEqual(cmd[cmd.index("-hwaccel_output_format") + 1], "cuda")
+
+    def test_build_scale_command_gpu_vaapi(self):
+        """Test VAAPI uploads frames once and scales on the device."""
+        cmd = FFmpegCommandBuilder.build_scale_command_gpu(
+            "input.mp4", "output.mp4", crf="26", video_codec="h264_vaapi", fps=30.0
+        )
+        self.assertEqual(cmd[cmd.index("-vaapi_device") + 1], "/dev/dri/renderD128")
+        self.assertLess(cmd.index("-vaapi_device"), cmd.index("-i"))
+        self.assertEqual(cmd[cmd.index("-vf") + 1], "fps=30.0,format=nv12,hwupload,scale_vaapi=1280:720")
+        self.assertEqual(cmd[cmd.index("-qp") + 1], "26")
+        self.assertNotIn("-preset", cmd)
+
     def test_build_scale_command_gpu_non_nvenc_codec(self):
         """Test GPU command with non-nvenc codec uses standard scale filter."""
         cmd = FFmpegCommandBuilder.build_scale_command_gpu(
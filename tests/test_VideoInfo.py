@@ -8,11 +8,31 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+import json
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
+from src.models import VideoInfo as video_info_module
 from src.models.VideoInfo import VideoInfo
 
 
+def _probe_json(codec_name="h264", width=1920, height=1080, r_frame_rate="30/1", duration="10.0",
+                **stream_fields):
+    """ffprobe -of json output for a single video stream."""
+    return _json_bytes({
+        "streams": [{
+            "codec_name": codec_name, "width": width, "height": height,
+            "r_frame_rate": r_frame_rate, **stream_fields,
+        }],
+        "format": {"duration": duration},
+    })
+
+
+def _json_bytes(data) -> bytes:
+    return json.dumps(data).encode("utf-8")
+
+
 class TestVideoInfo(unittest.TestCase):
     """Test cases for VideoInfo class."""
 
@@ -20,15 +40,47 @@ class TestVideoInfo(unittest.TestCase):
     def test_get_total_frames_success(self, mock_run):
         """Test successful frame count extraction."""
         mock_result = MagicMock()
-        mock_result.stdout = "30/1\n120.5\n"
+        mock_result.stdout = _probe_json(r_frame_rate="30/1", duration="120.5")
         mock_result.returncode = 0
         mock_run.return_value = mock_result
 
         frames = VideoInfo().get_total_frames("test_video.mp4")
 
-        self.assertEqual(frames, 3600)
+        self.assertEqual(frames, 3615)
         mock_run.assert_called_once()
 
+    @patch('src.models.VideoInfo.subprocess.run')
+    def test_get_total_frames_fractional_rate(self, mock_run):
+        """Test NTSC frame rates are not read as their numerator."""
+        mock_run.return_value = MagicMock(stdout=_probe_json(r_frame_rate="30000/1001", duration="10.01"))
+
+        frames = VideoInfo().get_total_frames("test_video.mp4")
+
+        self.assertEqual(frames, 300)
+
+    @patch('src.models.VideoInfo.subprocess.run')
+    def test_get_total_frames_prefers_container_count(self, mock_run):
+        """Test nb_frames wins over duration * fps, and avg_frame_rate is used for VFR."""
+        mock_run.return_value = MagicMock(stdout=_probe_json(duration="10.0", nb_frames="297"))
+        self.assertEqual(VideoInfo().get_total_frames("cfr.mp4"), 297)
+
+        mock_run.return_value = MagicMock(stdout=_probe_json(
+            r_frame_rate="60/1", duration="10.0", avg_frame_rate="24/1", nb_frames="N/A",
+        ))
+        self.assertEqual(VideoInfo().get_total_frames("vfr.mkv"), 240)
+
+    @patch('src.models.VideoInfo.subprocess.run')
+    def test_count_frames_reads_packets(self, mock_run):
+        """Test the exact count comes from -count_packets and replaces the estimate."""
+        mock_run.return_value = MagicMock(stdout=_json_bytes({"streams": [{"nb_read_packets": "1234"}]}))
+        vi = VideoInfo()
+        vi.video_path = "vfr.mkv"
+        vi.total_frames = 1200
+
+        self.assertEqual(vi.count_frames(), 1234)
+        self.assertEqual(vi.get_total_frames(), 1234)
+        self.assertIn("-count_packets", mock_run.call_args[0][0])
+
     @patch('src.models.VideoInfo.subprocess.run')
     def test_get_total_frames_ffprobe_error(self, mock_run):
         """Test frame extraction when ffprobe fails."""
@@ -42,7 +94,7 @@ class TestVideoInfo(unittest.TestCase):
     def test_get_video_info_success(self, mock_run):
         """Test successful video info extraction."""
         mock_result = MagicMock()
-        mock_result.stdout = "h264\n1920\n1080\n30/1\n"
+        mock_result.stdout = _probe_json(codec_name="h264", width=1920, height=1080, r_frame_rate="30/1")
         mock_result.returncode = 0
         mock_run.return_value = mock_result
 
@@ -63,6 +115,20 @@ class TestVideoInfo(unittest.TestCase):
 
         self.assertIsNone(info)
 
+    @patch('src.models.VideoInfo.subprocess.run')
+    def test_load_video_single_probe(self, mock_run):
+        """Test loading a video fills metadata from one ffprobe call."""
+        mock_run.return_value = MagicMock(stdout=_probe_json(width=1080, height=1920, duration="10.0"))
+
+        vi = VideoInfo("test_video.mp4")
+
+        mock_run.assert_called_once()
+        self.assertEqual(vi.get_video_info(), ("h264", 1080, 1920, "30/1"))
+        self.assertEqual(vi.get_duration(), 10.0)
+        self.assertEqual(vi.get_total_frames(), 300)
+        self.assertTrue(vi.is_vertical)
+        mock_run.assert_called_once()
+
     @patch.object(VideoInfo, 'load_video', return_value=False)
     @patch.object(VideoInfo, 'get_video_info')
     def test_check_compatibility_all_match(self, mock_get_info, _mock_load):
@@ -89,6 +155,15 @@ class TestVideoInfo(unittest.TestCase):
 
         self.assertFalse(result)
 
+    @patch.object(VideoInfo, '_extract_probe', return_value=None)
+    def test_probe_many_preserves_order(self, _mock_probe):
+        """Test concurrent probing returns results in input order."""
+        video_files = [f"video{i}.mp4" for i in range(8)]
+        infos = VideoInfo.probe_many(video_files)
+
+        self.assertEqual([vi.video_path for vi in infos], video_files)
+        self.assertEqual(VideoInfo.probe_many([]), [])
+
     def test_check_compatibility_empty_list(self):
         """Test compatibility check with empty list."""
         result = VideoInfo.check_compatibility([])
@@ -120,5 +195,63 @@ class TestVideoInfo(unittest.TestCase):
         self.assertIsNone(result)
 
 
+class TestProbeCache(unittest.TestCase):
+    """Test cases for the ffprobe result cache."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.video = os.path.join(self.tmp.name, "clip.mp4")
+        with open(self.video, "wb") as f:
+            f.write(b"x")
+        self.cache_file = Path(self.tmp.name) / "probe_cache.json"
+        patcher = patch.object(video_info_module, "_probe_cache_path", return_value=self.cache_file)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self._reset_cache()
+        self.addCleanup(self._reset_cache)
+        self.addCleanup(self.tmp.cleanup)
+
+    @staticmethod
+    def _reset_cache():
+        video_info_module._ffprobe_output.cache_clear()
+        video_info_module._disk_cache = None
+        video_info_module._disk_cache_dirty = False
+
+    @patch('src.models.VideoInfo.subprocess.run')
+    def test_repeat_probe_uses_cache(self, mock_run):
+        """Test an unchanged file is probed only once."""
+        mock_run.return_value = MagicMock(stdout=_probe_json(duration="12.5"))
+
+        self.assertEqual(VideoInfo().get_duration(self.video), 12.5)
+        self.assertEqual(VideoInfo().get_duration(self.video), 12.5)
+
+        mock_run.assert_called_once()
+
+    @patch('src.models.VideoInfo.subprocess.run')
+    def test_modified_file_is_reprobed(self, mock_run):
+        """Test a size change invalidates the cached result."""
+        mock_run.return_value = MagicMock(stdout=_probe_json(duration="12.5"))
+        VideoInfo().get_duration(self.video)
+        with open(self.video, "ab") as f:
+            f.write(b"more")
+        VideoInfo().get_duration(self.video)
+
+        self.assertEqual(mock_run.call_count, 2)
+
+    @patch('src.models.VideoInfo.subprocess.run')
+    def test_cache_persists_across_sessions(self, mock_run):
+        """Test saved results are reused after the in-memory cache is dropped."""
+        mock_run.return_value = MagicMock(stdout=_probe_json(duration="12.5"))
+        VideoInfo().get_duration(self.video)
+        self.assertTrue(video_info_module.save_probe_cache())
+        self.assertTrue(self.cache_file.is_file())
+        self.assertEqual(list(self.cache_file.parent.glob("*.tmp")), [])
+
+        self._reset_cache()
+        self.assertEqual(VideoInfo().get_duration(self.video), 12.5)
+
+        mock_run.assert_called_once()
+
+
 if __name__ == '__main__':
     unittest.main()
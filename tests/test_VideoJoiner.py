@@ -0,0 +1,114 @@
+"""Tests for VideoJoiner progress and helpers."""
+
+import io
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC))
+
+from models.VideoJoiner import VideoJoiner  # noqa: E402
+
+
+class _RecordingReporter:
+    def __init__(self):
+        self.progress = []
+        self.logs = []
+
+    def on_progress(self, metrics: dict) -> None:
+        self.progress.append(metrics)
+
+    def on_log(self, line: str) -> None:
+        self.logs.append(line)
+
+    def on_file_status(self, index: int, status: str) -> None:
+        pass
+
+
+def _fake_process(output: str, returncode: int = 0) -> MagicMock:
+    process = MagicMock()
+    process.stdout = io.BytesIO(output.encode("utf-8"))
+    process.returncode = returncode
+    return process
+
+
+def test_join_progress_uses_output_time(tmp_path):
+    output = (
+        "frame=10\nout_time_us=N/A\nprogress=continue\n"
+        "frame=100\nout_time_us=5000000\nprogress=continue\n"
+        "frame=200\nout_time_us=10000000\nprogress=end\n"
+    )
+    rep = _RecordingReporter()
+    with patch("models.VideoJoiner.subprocess.Popen", return_value=_fake_process(output)):
+        ok = VideoJoiner().join_videos(
+            "concat.txt", str(tmp_path / "out.mp4"), 2, reporter=rep, total_duration=10.0,
+        )
+
+    assert ok is True
+    assert [m["percent"] for m in rep.progress] == [50.0, 100.0]
+
+
+def test_join_progress_without_total_duration_reports_elapsed_output(tmp_path):
+    output = (
+        "out_time_us=N/A\nprogress=continue\n"
+        "out_time_us=65000000\nprogress=continue\n"
+        "out_time_us=65400000\nprogress=continue\n"
+        "out_time_us=3725000000\nprogress=end\n"
+    )
+    rep = _RecordingReporter()
+    with patch("models.VideoJoiner.subprocess.Popen", return_value=_fake_process(output)):
+        ok = VideoJoiner().join_videos(
+            "concat.txt", str(tmp_path / "out.mp4"), 2, reporter=rep, total_duration=None,
+        )
+
+    assert ok is True
+    assert all("percent" not in m for m in rep.progress)
+    assert [m["message"] for m in rep.progress] == [
+        "[2 files] Joined: 00:01:05 (total length unknown)",
+        "[2 files] Joined: 01:02:05 (total length unknown)",
+    ]
+
+
+def test_get_total_duration_sums_probes():
+    infos = [MagicMock(get_duration=MagicMock(return_value=d)) for d in (1.5, 2.5)]
+    with patch("models.VideoJoiner.VideoInfo.probe_many", return_value=infos):
+        assert VideoJoiner().get_total_duration(["a.mp4", "b.mp4"]) == 4.0
+
+    infos[1].get_duration.return_value = None
+    with patch("models.VideoJoiner.VideoInfo.probe_many", return_value=infos):
+        assert VideoJoiner().get_total_duration(["a.mp4", "b.mp4"]) is None
+
+
+def test_join_files_streams_concat_list(tmp_path):
+    process = _fake_process("progress=end\n")
+    with patch("models.VideoJoiner.subprocess.Popen", return_value=process) as mock_popen:
+        ok = VideoJoiner().join_files(["/videos/it's.mp4", "/videos/b.mp4"], str(tmp_path / "out.mp4"))
+
+    assert ok is True
+    cmd = mock_popen.call_args[0][0]
+    assert cmd[cmd.index("-i") + 1] == "pipe:0"
+    written = process.stdin.write.call_args[0][0].decode("utf-8")
+    assert written.count("file '") == 2
+    assert "it'\\''s.mp4" in written
+    process.stdin.close.assert_called_once()
+
+
+def test_get_video_files_filters_and_sorts(tmp_path):
+    for name in ("b.MP4", "a.mkv", "notes.txt", "noext"):
+        (tmp_path / name).write_bytes(b"x")
+    (tmp_path / "folder.mp4").mkdir()
+
+    files = VideoJoiner().get_video_files(str(tmp_path))
+
+    assert [Path(f).name for f in files] == ["a.mkv", "b.MP4"]
+
+
+def test_create_concat_file_writes_escaped_list(tmp_path):
+    videos = [str(tmp_path / "it's.mp4"), str(tmp_path / "b.mp4")]
+
+    concat_file = VideoJoiner().create_concat_file(videos, str(tmp_path))
+
+    lines = Path(concat_file).read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    assert lines[0].endswith("it'\\''s.mp4'")
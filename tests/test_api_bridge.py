@@ -2,6 +2,8 @@
 
 import json
 import sys
+import threading
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -10,7 +12,10 @@ import pytest
 SRC = Path(__file__).resolve().parent.parent / "src"
 sys.path.insert(0, str(SRC))
 
+from models.ConfigManager import ConfigManager  # noqa: E402
 from bridge.api_bridge import (  # noqa: E402
+    BridgeProgressReporter,
+    _BatchProgress,
     VideoEditorApi,
     _build_file_types,
     _looks_like_path,
@@ -19,8 +24,12 @@ from bridge.api_bridge import (  # noqa: E402
 
 
 @pytest.fixture
-def api():
-    return VideoEditorApi()
+def api(tmp_path):
+    # Keep settings the bridge saves (last folder, encoding choices) out of user_data/
+    with patch("models.ConfigManager._resolve_config_paths", return_value=(tmp_path, tmp_path / "config.json")):
+        config = ConfigManager()
+    with patch("bridge.api_bridge.get_config_manager", return_value=config):
+        return VideoEditorApi()
 
 
 def test_build_file_types():
@@ -69,9 +78,18 @@ def test_compress_get_options(api):
     assert "cap_cpu_50" in defaults
 
 
+def test_compress_get_last_input_folder(api):
+    with patch.object(api._config, "get_last_input_folder", return_value="/videos"), \
+            patch.object(api, "_check_gpu_available") as mock_gpu:
+        r = api.compress_get_last_input_folder()
+    assert r == {"status": "success", "last_input_folder": "/videos"}
+    mock_gpu.assert_not_called()
+
+
 def test_emit_event_calls_window_handler(api):
     api._window = MagicMock()
     api._emit_event("compress_progress", {"Progress:": "50.00%"})
+    api._events.join()
     api._window.evaluate_js.assert_called_once()
     js = api._window.evaluate_js.call_args[0][0]
     assert "window.compress_progress" in js
@@ -82,10 +100,45 @@ def test_emit_event_escapes_payload(api):
     api._window = MagicMock()
     payload = {"line": 'say "hello"\nworld'}
     api._emit_event("compress_log", payload)
+    api._events.join()
     js = api._window.evaluate_js.call_args[0][0]
     assert json.dumps(payload) in js
 
 
+def test_emit_event_batches_backlog_in_order(api):
+    api._window = MagicMock()
+    release = threading.Event()
+    api._window.evaluate_js.side_effect = lambda js: release.wait(1)
+    api._emit_event("compress_log", {"line": "first"})
+    time.sleep(0.05)  # dispatcher is now blocked inside evaluate_js
+    api._emit_event("compress_log", {"line": "second"})
+    api._emit_event("compress_log", {"line": "third"})
+    release.set()
+    api._events.join()
+
+    assert api._window.evaluate_js.call_count == 2
+    batch = api._window.evaluate_js.call_args[0][0]
+    assert batch.index("second") < batch.index("third")
+
+
+def test_bridge_reporter_coalesces_frame_progress(api):
+    api._window = MagicMock()
+    rep = BridgeProgressReporter(api, "job", "compress")
+    rep.on_progress({"percent": 10.0, "Progress:": "10.00%"})
+    rep.on_progress({"percent": 11.0, "Progress:": "11.00%"})
+    api._events.join()
+    assert api._window.evaluate_js.call_count == 1
+
+    rep.flush()
+    api._events.join()
+    assert api._window.evaluate_js.call_count == 2
+    assert "11.00%" in api._window.evaluate_js.call_args[0][0]
+
+    rep.on_progress({"Files Processed:": "1"})
+    api._events.join()
+    assert api._window.evaluate_js.call_count == 3
+
+
 def test_pick_files(api, tmp_path):
     video = tmp_path / "clip.mp4"
     video.write_bytes(b"x")
@@ -134,20 +187,117 @@ def test_run_compress_job_cancelled_emits_flag(api):
     job_id = "cancelled-job"
     api._jobs[job_id] = {"type": "compress", "state": "cancelled", "total": 0, "processed": 0}
     api._run_compress_job(job_id, [], {}, str(Path("/out")), "1920", "1080")
+    api._events.join()
     js = api._window.evaluate_js.call_args[0][0]
     assert "compress_complete" in js
     assert '"cancelled":true' in js.replace(" ", "")
 
 
+def test_compress_workers():
+    assert VideoEditorApi._compress_workers(True, 32) == 2
+    assert VideoEditorApi._compress_workers(True, 2) == 2
+    assert VideoEditorApi._compress_workers(False, 2) == 1
+    assert VideoEditorApi._compress_workers(False, 8) == 2
+    assert VideoEditorApi._compress_workers(False, 64) == 4
+
+
+def test_run_compress_job_parallel_uses_separate_processors(api):
+    api._window = MagicMock()
+    job_id = "parallel-job"
+    api._jobs[job_id] = {"type": "compress", "state": "running", "total": 4, "processed": 0}
+    videos = [{"path": f"/in/{i}.mp4"} for i in range(4)]
+    used = []
+
+    def fake_scale(self, *args, **kwargs):
+        used.append(self)
+        return True
+
+    info = MagicMock(fps=30.0, get_total_frames=MagicMock(return_value=300),
+                     get_duration=MagicMock(return_value=10.0))
+    with patch("bridge.api_bridge.available_cores", return_value=8), \
+            patch("bridge.api_bridge.VideoInfo.probe_many", return_value=[info] * 4), \
+            patch("bridge.api_bridge.VideoProcessor.scale_video_cpu", autospec=True, side_effect=fake_scale):
+        api._run_compress_job(job_id, videos, {}, "/out", "1280", "720")
+
+    assert len(used) == 4
+    assert api._jobs[job_id]["processed"] == 4
+    assert api._job_processors == {}
+
+
+def test_batch_progress_merges_parallel_files(api):
+    reporter = MagicMock()
+    batch = _BatchProgress(reporter, 4)
+    first = batch.for_file(0, "a.mp4")
+    second = batch.for_file(1, "b.mp4")
+
+    first.on_progress({"percent": 80.0, "frames_processed": 80, "total_frames": 100, "fps": 30.0})
+    second.on_progress({"percent": 20.0, "frames_processed": 40, "total_frames": 200, "fps": 10.0})
+    merged = reporter.on_progress.call_args[0][0]
+    assert merged["percent"] == 25.0
+    assert merged["Frames Processed:"] == "120/300"
+    assert merged["fps"] == 40.0
+    assert merged["Current File:"] == "a.mp4, b.mp4"
+
+    batch.finish(0)
+    merged = reporter.on_progress.call_args[0][0]
+    assert merged["percent"] == 30.0
+    assert merged["Current File:"] == "b.mp4"
+
+
+def test_run_compress_job_stream_copies_matching_source(api):
+    api._window = MagicMock()
+    job_id = "remux-job"
+    api._jobs[job_id] = {"type": "compress", "state": "running", "total": 2, "processed": 0}
+    videos = [{"path": "/in/same.mp4"}, {"path": "/in/big.mp4"}]
+    same = MagicMock(codec="h264", width=1280, height=720, fps=30.0)
+    big = MagicMock(codec="h264", width=1920, height=1080, fps=30.0)
+    with patch("bridge.api_bridge.VideoInfo.probe_many", return_value=[same, big]), \
+            patch.object(api._processor, "remux_video", return_value=True) as mock_remux, \
+            patch.object(api._processor, "scale_video_cpu", return_value=True) as mock_scale, \
+            patch.object(api, "_compress_workers", return_value=1):
+        api._run_compress_job(job_id, videos, {"copy_matching": True}, "/out", "1280", "720")
+
+    assert mock_remux.call_args[0][0] == "/in/same.mp4"
+    assert mock_scale.call_args[0][0] == "/in/big.mp4"
+
+
+def test_run_compress_job_reencodes_matching_source_with_crf(api):
+    api._window = MagicMock()
+    job_id = "crf-job"
+    api._jobs[job_id] = {"type": "compress", "state": "running", "total": 1, "processed": 0}
+    same = MagicMock(codec="h264", width=1280, height=720, fps=30.0)
+    with patch("bridge.api_bridge.VideoInfo.probe_many", return_value=[same]), \
+            patch.object(api._processor, "remux_video", return_value=True) as mock_remux, \
+            patch.object(api._processor, "scale_video_cpu", return_value=True) as mock_scale, \
+            patch.object(api, "_compress_workers", return_value=1):
+        api._run_compress_job(job_id, [{"path": "/in/same.mp4"}], {"crf": "28"}, "/out", "1280", "720")
+
+    mock_remux.assert_not_called()
+    assert mock_scale.call_args.kwargs["crf"] == "28"
+
+
+def test_run_compress_job_fast_encode_defaults_to_config(api):
+    api._window = MagicMock()
+    job_id = "defaults-job"
+    api._jobs[job_id] = {"type": "compress", "state": "running", "total": 1, "processed": 0}
+    info = MagicMock(codec="hevc", width=1920, height=1080, fps=30.0)
+    with patch("bridge.api_bridge.VideoInfo.probe_many", return_value=[info]), \
+            patch.object(api._config, "get_fast_encode_setting", return_value=True), \
+            patch.object(api._processor, "scale_video_cpu", return_value=True) as mock_scale, \
+            patch.object(api, "_compress_workers", return_value=1):
+        api._run_compress_job(job_id, [{"path": "/in/a.mp4"}], {}, "/out", "1280", "720")
+
+    assert mock_scale.call_args.kwargs["fast_encode"] is True
+
+
 def test_run_join_job_cancelled(api):
     api._window = MagicMock()
     job_id = "join-cancelled"
     api._jobs[job_id] = {"type": "join", "state": "cancelled"}
     api._joiner = MagicMock()
-    api._joiner.create_concat_file.return_value = "/tmp/concat.txt"
-    api._joiner.join_videos.return_value = False
-    with patch("bridge.api_bridge.os.path.exists", return_value=True), patch("bridge.api_bridge.os.remove"):
-        api._run_join_job(job_id, "/in", "/out", ["a.mp4", "b.mp4"])
+    api._joiner.join_files.return_value = False
+    api._run_join_job(job_id, "/in", "/out", ["a.mp4", "b.mp4"])
+    api._events.join()
     js = api._window.evaluate_js.call_args[0][0]
     assert "join_complete" in js
     assert '"cancelled":true' in js.replace(" ", "")
@@ -0,0 +1,65 @@
+"""Tests for the headless CLI."""
+
+import io
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC))
+
+import cli  # noqa: E402
+from models.VideoProcessor import VideoProcessor  # noqa: E402
+
+
+@pytest.fixture
+def ffmpeg_commands(tmp_path, monkeypatch):
+    """Run `cli compress` on one queued file and collect the FFmpeg commands it starts."""
+    incoming = tmp_path / ".incoming"
+    incoming.mkdir()
+    (incoming / "clip.mp4").write_bytes(b"x")
+    monkeypatch.setattr(cli, "INCOMING_DIR", incoming)
+    monkeypatch.setattr(cli, "OUTPUT_DIR", tmp_path / "output")
+
+    config = MagicMock()
+    config.get_encoding_settings.return_value = ("30", "ultrafast", "HD")
+    config.get_performance_settings.return_value = (False, False)
+    config.get_fast_encode_setting.return_value = True
+    monkeypatch.setattr(cli, "get_config_manager", lambda: config)
+
+    info = MagicMock(codec="hevc", width=1920, height=1080, fps=30.0,
+                     get_total_frames=MagicMock(return_value=300),
+                     get_duration=MagicMock(return_value=10.0))
+    monkeypatch.setattr(cli.VideoInfo, "probe_many", lambda paths: [info] * len(paths))
+
+    commands = []
+
+    def fake_start(cmd):
+        commands.append(cmd)
+        process = MagicMock()
+        process.stdout = io.BytesIO(b"progress=end\n")
+        process.wait.return_value = 0
+        return process
+
+    monkeypatch.setattr(VideoProcessor, "_start_ffmpeg", staticmethod(fake_start))
+    return commands
+
+
+def test_compress_uses_fast_encode_setting(ffmpeg_commands, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["cli.py", "compress", "--cpu"])
+    cli.main()
+
+    cmd = ffmpeg_commands[0]
+    assert cmd[cmd.index("-x264-params") + 1] == "rc-lookahead=20"
+    assert cmd[cmd.index("-movflags") + 1] == "+faststart"
+
+
+def test_compress_no_fast_encode_flag(ffmpeg_commands, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["cli.py", "compress", "--cpu", "--no-fast-encode"])
+    cli.main()
+
+    cmd = ffmpeg_commands[0]
+    assert "-x264-params" not in cmd
+    assert "-movflags" not in cmd
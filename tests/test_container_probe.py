@@ -0,0 +1,61 @@
+"""Tests for the MP4/MOV header reader."""
+
+import struct
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC))
+
+from models.container_probe import probe_mp4  # noqa: E402
+
+
+def _box(box_type: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def _mp4(fourcc=b"avc1", width=1280, height=720, timescale=30000, stts=((300, 1001),), mdat_first=False) -> bytes:
+    length = sum(count * delta for count, delta in stts)
+    mvhd = _box(b"mvhd", struct.pack(">IIIII", 0, 0, 0, 1000, length * 1000 // timescale) + bytes(80))
+    mdhd = _box(b"mdhd", struct.pack(">IIIII", 0, 0, 0, timescale, length) + bytes(4))
+    hdlr = _box(b"hdlr", struct.pack(">II4s", 0, 0, b"vide") + bytes(12))
+    entry = _box(fourcc, bytes(24) + struct.pack(">HH", width, height) + bytes(50))
+    stsd = _box(b"stsd", struct.pack(">II", 0, 1) + entry)
+    stts_box = _box(b"stts", struct.pack(">II", 0, len(stts)) + b"".join(struct.pack(">II", *e) for e in stts))
+    stbl = _box(b"stbl", stsd + stts_box)
+    trak = _box(b"trak", _box(b"mdia", mdhd + hdlr + _box(b"minf", stbl)))
+    moov = _box(b"moov", mvhd + trak)
+    ftyp = _box(b"ftyp", b"isom" + bytes(4))
+    mdat = _box(b"mdat", bytes(64))
+    return ftyp + (mdat + moov if mdat_first else moov + mdat)
+
+
+def test_probe_mp4_reads_header(tmp_path):
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(_mp4(mdat_first=True))
+
+    codec, width, height, rate, duration, frames = probe_mp4(str(path))
+
+    assert (codec, width, height, rate, frames) == ("h264", 1280, 720, "30000/1001", 300)
+    assert abs(duration - 10.01) < 0.01
+
+
+def test_probe_mp4_variable_rate_uses_average(tmp_path):
+    path = tmp_path / "vfr.mp4"
+    path.write_bytes(_mp4(timescale=90000, stts=((100, 3000), (100, 6000))))
+
+    result = probe_mp4(str(path))
+
+    assert result[3] == "20/1"
+    assert result[5] == 200
+
+
+def test_probe_mp4_falls_back_on_unknown_input(tmp_path):
+    unknown_codec = tmp_path / "prores.mov"
+    unknown_codec.write_bytes(_mp4(fourcc=b"apch"))
+    not_mp4 = tmp_path / "text.mp4"
+    not_mp4.write_bytes(b"not a video")
+
+    assert probe_mp4(str(unknown_codec)) is None
+    assert probe_mp4(str(not_mp4)) is None
+    assert probe_mp4(str(tmp_path / "missing.mp4")) is None
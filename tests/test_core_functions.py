@@ -35,3 +35,13 @@ def test_materialize_splash_url(tmp_path, monkeypatch):
     text = cached.read_text(encoding="utf-8")
     assert "{{INDEX_URI}}" not in text
     assert "file:" in text
+
+
+def test_available_cores_uses_affinity(monkeypatch):
+    monkeypatch.delattr(cf.os, "process_cpu_count", raising=False)
+    monkeypatch.setattr(cf.os, "sched_getaffinity", lambda pid: {0, 1}, raising=False)
+    monkeypatch.setattr(cf.os, "cpu_count", lambda: 64)
+    assert cf.available_cores() == 2
+
+    monkeypatch.delattr(cf.os, "sched_getaffinity")
+    assert cf.available_cores() == 64
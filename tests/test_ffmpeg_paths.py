@@ -2,7 +2,7 @@
 
 import sys
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -12,10 +12,24 @@ sys.path.insert(0, str(SRC))
 from utils import ffmpeg_paths  # noqa: E402
 
 
-def test_get_ffmpeg_exe_fallback():
-    with patch.object(ffmpeg_paths, "_vendor_win64_dir") as mock_dir:
+def test_get_ffmpeg_exe_fallback(monkeypatch):
+    monkeypatch.setattr(ffmpeg_paths, "_exe_paths", {})
+    with patch.object(ffmpeg_paths, "_vendor_win64_dir") as mock_dir, \
+            patch.object(ffmpeg_paths.shutil, "which", return_value=None):
         mock_dir.return_value = Path("/nonexistent/vendor")
         assert ffmpeg_paths.get_ffmpeg_exe() == "ffmpeg"
+    assert ffmpeg_paths._exe_paths == {}
+
+
+def test_get_ffmpeg_exe_resolves_path_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(ffmpeg_paths, "_exe_paths", {})
+    exe = tmp_path / "ffmpeg"
+    with patch.object(ffmpeg_paths, "_vendor_win64_dir", return_value=Path("/nonexistent/vendor")), \
+            patch.object(ffmpeg_paths.shutil, "which", return_value=str(exe)) as mock_which:
+        assert ffmpeg_paths.get_ffmpeg_exe() == str(exe)
+        assert ffmpeg_paths.get_ffmpeg_exe() == str(exe)
+        assert ffmpeg_paths.is_bundled() is False
+    mock_which.assert_called_once_with("ffmpeg")
 
 
 def test_read_notice_text_contains_ffmpeg():
@@ -30,3 +44,88 @@ def test_get_ffmpeg_info_keys():
     assert "notice" in info
     assert "legal_url" in info
     assert "https://ffmpeg.org" in info["project_url"]
+
+
+def test_detect_hw_encoder_prefers_listed_order():
+    listing = (
+        "Encoders:\n"
+        " V....D libx264              libx264 H.264 / AVC\n"
+        " V....D h264_qsv             H.264 (Intel Quick Sync Video)\n"
+        " V....D h264_nvenc           NVIDIA NVENC H.264 encoder\n"
+    )
+    ffmpeg_paths.detect_hw_encoder.cache_clear()
+    try:
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value.stdout = listing
+            mock_run.return_value.returncode = 0
+            assert ffmpeg_paths.detect_hw_encoder() == "h264_nvenc"
+            assert ffmpeg_paths.detect_hw_encoder() == "h264_nvenc"
+        assert mock_run.call_count == 2  # -encoders, then one test encode
+    finally:
+        ffmpeg_paths.detect_hw_encoder.cache_clear()
+
+
+def test_detect_hw_encoder_skips_encoder_that_fails_to_open():
+    listing = (
+        "Encoders:\n"
+        " V....D h264_nvenc           NVIDIA NVENC H.264 encoder\n"
+        " V....D h264_qsv             H.264 (Intel Quick Sync Video)\n"
+        " V....D h264_amf             AMD AMF H.264 Encoder\n"
+    )
+    tried = []
+
+    def fake_run(cmd, **kwargs):
+        if "-encoders" in cmd:
+            return MagicMock(stdout=listing, returncode=0)
+        encoder = cmd[cmd.index("-c:v") + 1]
+        tried.append(encoder)
+        # An Intel machine: the build lists NVENC but no NVIDIA driver is present
+        return MagicMock(returncode=0 if encoder == "h264_qsv" else 1)
+
+    ffmpeg_paths.detect_hw_encoder.cache_clear()
+    try:
+        with patch("subprocess.run", side_effect=fake_run):
+            assert ffmpeg_paths.detect_hw_encoder() == "h264_qsv"
+        assert tried == ["h264_nvenc", "h264_qsv"]
+    finally:
+        ffmpeg_paths.detect_hw_encoder.cache_clear()
+
+
+def test_available_filters_parses_listing():
+    listing = (
+        "Filters:\n"
+        " ... scale             V->V       Scale the input video size.\n"
+        " TSC zscale            V->V       Apply resizing, colorspace and bit depth conversion.\n"
+    )
+    ffmpeg_paths.available_filters.cache_clear()
+    try:
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value.stdout = listing
+            assert {"scale", "zscale"} <= ffmpeg_paths.available_filters()
+    finally:
+        ffmpeg_paths.available_filters.cache_clear()
+
+
+def test_ffmpeg_version_line_cached_after_success():
+    with patch.object(ffmpeg_paths, "_version_line", None), patch("subprocess.run") as mock_run:
+        mock_run.side_effect = FileNotFoundError("ffmpeg")
+        assert ffmpeg_paths.check_ffmpeg_available() is False
+
+        mock_run.side_effect = None
+        mock_run.return_value.stdout = "ffmpeg version 7.0\nbuilt with gcc\n"
+        assert ffmpeg_paths.ffmpeg_version_line() == "ffmpeg version 7.0"
+        assert ffmpeg_paths.check_ffmpeg_available() is True
+        assert mock_run.call_count == 2
+
+
+def test_bundled_exe_resolved_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(ffmpeg_paths, "_bundled_paths", {})
+    monkeypatch.setattr(ffmpeg_paths, "_exe_paths", {})
+    monkeypatch.setattr(ffmpeg_paths.shutil, "which", lambda name: None)
+    (tmp_path / "ffmpeg.exe").write_bytes(b"")
+    with patch.object(ffmpeg_paths, "_vendor_win64_dir", return_value=tmp_path) as mock_dir:
+        first = ffmpeg_paths.get_ffmpeg_exe()
+        assert ffmpeg_paths.get_ffmpeg_exe() == first == str((tmp_path / "ffmpeg.exe").resolve())
+        assert ffmpeg_paths.ffmpeg_bin_dir() == str(tmp_path.resolve())
+        assert ffmpeg_paths.get_ffprobe_exe() == "ffprobe"
+    assert mock_dir.call_count == 2  # one hit for ffmpeg, one miss for ffprobe
@@ -1,7 +1,10 @@
 """Tests for ProgressReporter with VideoProcessor (no Tk)."""
 
+import io
+import os
 import sys
 from pathlib import Path
+from unittest.mock import MagicMock, patch
 
 SRC = Path(__file__).resolve().parent.parent / "src"
 sys.path.insert(0, str(SRC))
@@ -22,6 +25,12 @@ def test_print_reporter_logs():
     rep.on_log("hello\n")
 
 
+def test_print_reporter_prefixes_progress(capsys):
+    rep = PrintProgressReporter("[a.mp4] ")
+    rep.on_progress({"percent": 50.0, "fps": 30.0, "time_remaining": "00:00:10"})
+    assert capsys.readouterr().out.startswith("[a.mp4] Progress: 50.00%")
+
+
 def test_video_processor_has_no_tk_import():
     import models.VideoProcessor as vp
     source = Path(vp.__file__).read_text(encoding="utf-8")
@@ -31,3 +40,130 @@ def test_video_processor_has_no_tk_import():
 
 def test_format_file_size():
     assert "KB" in VideoProcessor.format_file_size(2048)
+
+
+class _RecordingReporter:
+    def __init__(self):
+        self.progress = []
+
+    def on_progress(self, metrics: dict) -> None:
+        self.progress.append(metrics)
+
+    def on_log(self, line: str) -> None:
+        pass
+
+    def on_file_status(self, index: int, status: str) -> None:
+        pass
+
+
+def test_process_ffmpeg_output_parses_progress_blocks():
+    process = MagicMock()
+    process.stdout = io.BytesIO(
+        b"frame=50\nfps=25.0\nout_time_ms=2000000\nprogress=continue\n"
+        b"[libx264 @ 0x1] Error while opening encoder\n"
+        b"frame=100\nfps=25.0\nout_time_ms=4000000\nprogress=end\n"
+    )
+    process.wait.return_value = 0
+    rep = _RecordingReporter()
+
+    code, errors = VideoProcessor()._process_ffmpeg_output(process, rep, total_frames=100)
+
+    assert code == 0
+    assert errors == ["[libx264 @ 0x1] Error while opening encoder"]
+    assert [m["frames_processed"] for m in rep.progress] == [50, 100]
+    assert rep.progress[-1]["percent"] == 100.0
+
+
+def test_process_ffmpeg_output_keeps_last_error_lines():
+    process = MagicMock()
+    process.stdout = io.BytesIO(
+        b"".join(b"[h264 @ 0x1] error in frame %d\n" % i for i in range(60)) + b"progress=end\n"
+    )
+    process.wait.return_value = 1
+
+    code, errors = VideoProcessor()._process_ffmpeg_output(process, _RecordingReporter())
+
+    assert code == 1
+    assert len(errors) == 50
+    assert errors[0].endswith("frame 10")
+    assert errors[-1].endswith("frame 59")
+
+
+def test_start_ffmpeg_lowers_priority():
+    process = MagicMock(pid=4321)
+    with patch("models.VideoProcessor.subprocess.Popen", return_value=process) as mock_popen, \
+            patch("models.VideoProcessor.os.setpriority", create=True) as mock_nice:
+        assert VideoProcessor._start_ffmpeg(["ffmpeg"]) is process
+
+    if hasattr(os, "setpriority"):
+        mock_nice.assert_called_once_with(os.PRIO_PROCESS, 4321, 10)
+    # A bare name can't use posix_spawn, so fds are closed as usual
+    assert mock_popen.call_args.kwargs["close_fds"] is True
+
+
+def test_start_ffmpeg_spawns_absolute_executable(tmp_path, monkeypatch):
+    from models.FFmpegCommandBuilder import FFmpegCommandBuilder
+    from utils import ffmpeg_paths
+
+    monkeypatch.setattr(ffmpeg_paths, "_exe_paths", {})
+    monkeypatch.setattr(ffmpeg_paths, "_vendor_win64_dir", lambda: tmp_path / "vendor")
+    monkeypatch.setattr(ffmpeg_paths.shutil, "which", lambda name: str(tmp_path / name))
+    cmd = FFmpegCommandBuilder.build_scale_command_cpu("in.mp4", "out.mp4")
+    with patch("models.VideoProcessor.subprocess.Popen") as mock_popen, \
+            patch("models.VideoProcessor.os.setpriority", create=True):
+        VideoProcessor._start_ffmpeg(cmd)
+
+    argv = mock_popen.call_args[0][0]
+    assert os.path.isabs(argv[0])
+    assert mock_popen.call_args.kwargs["close_fds"] is (os.name == "nt")
+
+
+def test_scale_video_gpu_falls_back_to_cpu_on_hw_decode_error(tmp_path):
+    vp = VideoProcessor()
+    errors = ["[h264 @ 0x1] Failed setup for format cuda: hwaccel initialisation returned error."]
+    with patch.object(VideoProcessor, "_start_ffmpeg"), \
+            patch.object(VideoProcessor, "_process_ffmpeg_output", return_value=(1, errors)), \
+            patch.object(VideoProcessor, "scale_video_cpu", return_value=True) as mock_cpu:
+        ok = vp.scale_video_gpu(
+            "in.mp4", str(tmp_path / "out.mp4"), input_duration=10.0, input_fps=30.0,
+            video_codec="h264_nvenc", fast_encode=True,
+        )
+
+    assert ok is True
+    assert mock_cpu.call_args.kwargs["fast_encode"] is True
+
+
+def test_scale_video_gpu_falls_back_for_non_nvidia_encoder(tmp_path):
+    vp = VideoProcessor()
+    errors = ["[h264_qsv @ 0x1] Error initializing an internal MFX session: unsupported (-3)"]
+    rep = MagicMock()
+    with patch.object(VideoProcessor, "_start_ffmpeg"), \
+            patch.object(VideoProcessor, "_process_ffmpeg_output", return_value=(1, errors)), \
+            patch.object(VideoProcessor, "scale_video_cpu", return_value=True) as mock_cpu:
+        ok = vp.scale_video_gpu(
+            "in.mp4", str(tmp_path / "out.mp4"), reporter=rep, input_duration=10.0, input_fps=30.0,
+            video_codec="h264_qsv",
+        )
+
+    assert ok is True
+    mock_cpu.assert_called_once()
+    assert any("MFX session" in call.args[0] for call in rep.on_log.call_args_list)
+
+
+def test_ffmpeg_error_code_descriptions():
+    assert VideoProcessor._get_ffmpeg_error_code(0) == "Success"
+    assert "see messages" in VideoProcessor._get_ffmpeg_error_code(1)
+    assert VideoProcessor._get_ffmpeg_error_code(-9) == "Terminated by SIGKILL"
+    assert VideoProcessor._get_ffmpeg_error_code(0xC0000005) == "Crashed (status 0xC0000005)"
+
+
+def test_failure_summary_is_one_log_event():
+    rep = MagicMock()
+    errors = [f"[mov @ 0x1] moov atom not found ({i})" for i in range(20)]
+
+    assert VideoProcessor()._handle_process_result(1, errors, "out.mp4", rep) is False
+
+    assert rep.on_log.call_count == 2  # status line + summary
+    summary = rep.on_log.call_args[0][0]
+    assert summary.startswith("  ! HINT: Input file may be corrupted")
+    assert summary.count("  - ") == 20